@@ -4,20 +4,37 @@ Base API Key Generator module
 Contains the abstract base class for API key generation
 """
 
-from pathlib import Path
+from os_detector import OSDetector
+from honeytoken_registry import register_issued
+from apikeygenerator.credential_synthesis import CREDENTIAL_SYNTHESIZER
 
 
 class APIKeyGenerator:
     """Base class for API key generation"""
     
     def __init__(self):
+        self.profile = OSDetector.get_profile()
         self.api_dir = self._get_api_directory()
+        # Every run issues new, format-valid credentials
+        self.synthesizer = CREDENTIAL_SYNTHESIZER
+        # (kind, secret, file name) of every secret in the last generated files
+        self.issued_secrets = []
     
     def _get_api_directory(self):
         """Get the default API keys directory path for the current OS"""
-        home = Path.home()
+        home = self.profile.home
         return home / '.api_keys'
     
+    def _get_credential_files(self):
+        """Get freshly synthesized credential files keyed by file name"""
+        self.issued_secrets = []
+        return self.synthesizer.credential_files(self.issued_secrets)
+    
+    def _register_issued(self, result):
+        """Record the issued secrets in the honeytoken registry once the files are written"""
+        return register_issued(result, [(kind, token, str(self.api_dir / file_name))
+                                        for kind, token, file_name in self.issued_secrets])
+    
     def generate_keys(self):
         """Abstract method to be implemented by subclasses"""
         raise NotImplementedError("Subclasses must implement generate_keys method")
\ No newline at end of file
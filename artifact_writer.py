@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Artifact Writer module
+Writes generated artifact files directly from Python without spawning shell processes
+"""
+
+import os
+from pathlib import Path
+
+
+class ArtifactWriter:
+    """Collects (path, bytes, mode) records and writes them to disk in-process"""
+
+    def __init__(self, root, dir_mode=0o755):
+        self.root = Path(root)
+        self.dir_mode = dir_mode
+        self.directories = []
+        self.records = []
+
+    def add_directory(self, relative_path, mode=None):
+        """Register a directory (relative to the root) that must exist before writing"""
+        self.directories.append((self.root / relative_path, self.dir_mode if mode is None else mode))
+
+    def add_file(self, relative_path, content, mode=0o644):
+        """Register a file record (relative to the root) to be written"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self.records.append((self.root / relative_path, content, mode))
+
+    def _write_record(self, path, content, mode):
+        """Write a single record with one open/write/close sequence"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            view = memoryview(content)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+        # os.open only applies the mode to newly created files (and honours umask)
+        os.chmod(path, mode)
+
+    def write(self):
+        """Write all registered directories and files, returning the written file paths"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for directory, _ in self.directories:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        written = []
+        for path, content, mode in self.records:
+            self._write_record(path, content, mode)
+            written.append(path)
+
+        # Apply directory permissions last, mirroring the chmod calls of the old scripts
+        for directory, mode in self.directories:
+            os.chmod(directory, mode)
+        os.chmod(self.root, self.dir_mode)
+
+        return written
+
+    def execute(self, success_message):
+        """Write all records and return a subprocess-like result object"""
+        try:
+            self.write()
+        except OSError as e:
+            return type('Result', (), {
+                'returncode': 1,
+                'stdout': '',
+                'stderr': f"Failed to write artifacts in {self.root}: {e}"
+            })()
+
+        return type('Result', (), {
+            'returncode': 0,
+            'stdout': success_message,
+            'stderr': ''
+        })()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Batch Runner module
+Runs Application operations headlessly from a JSON or TOML manifest and reports machine-readable results
+"""
+
+import json
+import os
+import random
+import socket
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+class ManifestError(ValueError):
+    """Raised when a batch manifest cannot be loaded or is invalid"""
+
+
+class BatchRunner:
+    """Runs the selected operations of an Application without any prompts
+
+    Manifest keys (all optional except ``operations``):
+        operations   list of generator plugin keys (ssh_keys, web_history, documents,
+                     api_keys, source_code, logs and any installed plugin), 'all'
+                     or menu numbers
+        counts       per-operation volume settings, keyed by operation name
+                     (known_hosts: hashed ~/.ssh/known_hosts entries,
+                     ssh_config_hosts: Host blocks of ~/.ssh/config,
+                     authorized_keys: keys in ~/.ssh/authorized_keys,
+                     web_history: visits per browser database,
+                     documents: documents rendered from the templates,
+                     logs: lines per log, log_bytes: bytes per log (both
+                     split across the live file and its rotations),
+                     log_rotations: rotated generations kept per log,
+                     login_records: wtmp sessions of the Linux login records,
+                     event_records: records per Windows .evtx channel)
+        output_root  directory used as the home directory for every artifact
+        registry     honeytoken registry file, resolved before output_root
+                     (default: A_K_DATATRAP_REGISTRY or the per-user file)
+        seed         seed for the random module, for reproducible content;
+                     implies sequential operations
+        parallel     run independent operations concurrently (default true,
+                     ignored when a seed is set)
+        report       file to write the JSON report to instead of stdout
+    """
+
+    def __init__(self, application):
+        self.app = application
+
+    @staticmethod
+    def load_manifest(manifest_path):
+        """Load a manifest from a .json or .toml file"""
+        path = Path(manifest_path)
+        try:
+            if path.suffix.lower() == '.toml':
+                if tomllib is None:
+                    raise ManifestError("TOML manifests require Python 3.11+ (tomllib)")
+                with open(path, 'rb') as f:
+                    manifest = tomllib.load(f)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            if isinstance(e, ManifestError):
+                raise
+            raise ManifestError(f"Could not load manifest {path}: {e}") from e
+
+        if not isinstance(manifest, dict):
+            raise ManifestError("Manifest must be a mapping at the top level")
+        return manifest
+
+    def operation_keys(self):
+        """Return the manifest operation names mapped to the interactive menu numbers"""
+        keys = {plugin.key: number for number, plugin in self.app._get_plugins().items()}
+        keys['all'] = self.app._get_menu_actions()[0]
+        return keys
+
+    def resolve_operations(self, manifest):
+        """Translate the manifest operation list into menu numbers"""
+        operations = manifest.get('operations')
+        if not operations:
+            raise ManifestError("Manifest must list at least one operation")
+
+        operation_keys = self.operation_keys()
+        all_choice = operation_keys['all']
+        choices = []
+        for operation in operations:
+            if isinstance(operation, int) and 1 <= operation <= all_choice:
+                choice = operation
+            elif isinstance(operation, str) and operation in operation_keys:
+                choice = operation_keys[operation]
+            else:
+                raise ManifestError(
+                    f"Unknown operation '{operation}'. Use one of: {', '.join(operation_keys)}"
+                )
+            if choice not in choices:
+                choices.append(choice)
+        return list(range(1, all_choice)) if all_choice in choices else choices
+
+    def _apply_settings(self, manifest):
+        """Configure the application and environment from the manifest"""
+        registry = manifest.get('registry')
+        if registry:
+            # Relative paths and ~ refer to the invoking user, not the decoy home
+            from honeytoken_registry import HONEYTOKEN_REGISTRY
+            HONEYTOKEN_REGISTRY.relocate(registry)
+
+        output_root = manifest.get('output_root')
+        if output_root:
+            # Every generator derives its output directories from the home
+            # directory, so pointing it at the output root relocates them all
+            root = Path(output_root).expanduser().resolve()
+            root.mkdir(parents=True, exist_ok=True)
+            os.environ['HOME'] = str(root)
+            os.environ['USERPROFILE'] = str(root)
+
+        if 'seed' in manifest:
+            random.seed(manifest['seed'])
+
+        self.app.assume_yes = True
+        self.app.interactive_operations = set()
+        # Concurrent operations would interleave their draws from the seeded
+        # random module, so a seeded run is always sequential
+        self.app.parallel = bool(manifest.get('parallel', True)) and 'seed' not in manifest
+        self.app.counts = dict(manifest.get('counts', {}))
+
+    def _build_report(self, manifest, choices, success, started, duration):
+        """Build the machine-readable report for a batch run"""
+        key_names = {number: key for key, number in self.operation_keys().items()}
+        operations = self.app._get_operations()
+        report_operations = []
+        for choice in choices:
+            op_name = operations[choice][0]
+            outcome = self.app.operation_results.get(op_name, {
+                'success': False, 'returncode': 1, 'stdout': '', 'stderr': 'Operation did not run'
+            })
+            report_operations.append({'id': choice, 'key': key_names[choice], 'name': op_name, **outcome})
+
+        return {
+            'host': socket.gethostname(),
+            'system': self.app.detector.get_system_name(),
+            'output_root': manifest.get('output_root', str(Path.home())),
+            'seed': manifest.get('seed'),
+            'started_at': started,
+            'duration_seconds': round(duration, 3),
+            'success': success,
+            'operations': report_operations
+        }
+
+    def run(self, manifest_path):
+        """Run a manifest and emit its JSON report, returning a process exit code"""
+        try:
+            manifest = self.load_manifest(manifest_path)
+            choices = self.resolve_operations(manifest)
+        except ManifestError as e:
+            print(json.dumps({'success': False, 'error': str(e)}))
+            return 2
+
+        if not self.app.detector.is_supported():
+            print(json.dumps({
+                'success': False,
+                'error': f"Unsupported operating system: {self.app.detector.get_system_name()}"
+            }))
+            return 1
+
+        self._apply_settings(manifest)
+
+        started = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        start_time = time.perf_counter()
+        # Human-readable progress goes to stderr so stdout carries only the report
+        with redirect_stdout(sys.stderr):
+            self.app._execute_selected_operations(choices)
+        duration = time.perf_counter() - start_time
+
+        success = all(self.app.operation_results.get(name, {}).get('success', False)
+                      for name, _ in (self.app._get_operations()[choice] for choice in choices))
+        report = self._build_report(manifest, choices, success, started, duration)
+
+        report_path = manifest.get('report')
+        if report_path:
+            with open(Path(report_path).expanduser(), 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+
+        return 0 if success else 1
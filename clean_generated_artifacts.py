@@ -12,6 +12,8 @@ from typing import List, Dict, Set
 import platform
 import logging
 from datetime import datetime
+from content_cache import ContentCache
+from sshkeygenerator.ssh_key_generator import SSHKeyGenerator
 
 
 class ArtifactCleaner:
@@ -24,6 +26,8 @@ class ArtifactCleaner:
         self.failed_count = 0
         self.skipped_count = 0
         self.total_size_freed = 0
+        # Files shared with the user's own entries: only the generated block is removed from them
+        self.generated_block_files: Set[Path] = set()
         
         # Setup logging
         self._setup_logging()
@@ -35,7 +39,8 @@ class ArtifactCleaner:
             'Generated Documents': self._get_document_paths,
             'Generated Logs': self._get_log_paths,
             'Source Code': self._get_source_code_paths,
-            'Browser History Backups': self._get_browser_backup_paths
+            'Browser History Backups': self._get_browser_backup_paths,
+            'Content Cache': self._get_cache_paths
         }
     
     def _setup_logging(self):
@@ -61,17 +66,37 @@ class ArtifactCleaner:
         ssh_dir = self.home / ".ssh"
         paths = []
         
-        # Standard SSH key files
-        ssh_files = ["id_rsa", "id_rsa.pub", "id_ed25519", "id_ed25519.pub", 
-                    "id_ecdsa", "id_ecdsa.pub", "id_dsa", "id_dsa.pub"]
-        
-        for fname in ssh_files:
+        # Key files, as written by the generator
+        for fname in SSHKeyGenerator.key_file_names():
             fpath = ssh_dir / fname
             if fpath.exists():
                 paths.append(fpath)
         
+        # known_hosts, config and authorized_keys keep the user's own entries
+        for fname in SSHKeyGenerator.environment_file_names():
+            fpath = ssh_dir / fname
+            if fpath.is_file() and SSHKeyGenerator.BLOCK_BEGIN in self._read_text(fpath):
+                paths.append(fpath)
+                self.generated_block_files.add(fpath)
+        
         return paths
     
+    def _read_text(self, path: Path) -> str:
+        """Read a text file, returning an empty string if it cannot be read"""
+        try:
+            return path.read_text(encoding='utf-8')
+        except (OSError, UnicodeError):
+            return ''
+    
+    def _remove_generated_block(self, path: Path) -> int:
+        """Remove the generated entries from a shared file in place, keeping its mode; returns the bytes freed"""
+        content = path.read_text(encoding='utf-8')
+        stripped, _ = SSHKeyGenerator.strip_generated_block(content)
+        with open(path, 'r+', encoding='utf-8', newline='') as f:
+            f.write(stripped)
+            f.truncate()
+        return len(content.encode('utf-8')) - len(stripped.encode('utf-8'))
+    
     def _get_api_paths(self) -> List[Path]:
         """Get API key related paths"""
         paths = []
@@ -169,6 +194,14 @@ class ArtifactCleaner:
         
         return paths
     
+    def _get_cache_paths(self) -> List[Path]:
+        """Get the on-disk content cache files"""
+        cache_dir = ContentCache.default_directory()
+        if not cache_dir.exists():
+            return []
+        # Only the cached payloads: the directory also holds the pre-generated SSH key reservoirs
+        return sorted(cache_dir.glob('*.marshal'))
+    
     def _get_file_size(self, path: Path) -> int:
         """Get size of file or directory in bytes"""
         try:
@@ -216,7 +249,10 @@ class ArtifactCleaner:
             # Get size before deletion for reporting
             size = self._get_file_size(path)
             
-            if path.is_file():
+            if path in self.generated_block_files:
+                size = self._remove_generated_block(path)
+                self.logger.info(f"Removed generated entries from: {path}")
+            elif path.is_file():
                 path.unlink()
                 self.logger.info(f"Deleted file: {path}")
             elif path.is_dir():
@@ -271,7 +307,10 @@ class ArtifactCleaner:
                 size_str = self._format_size(size)
                 path_type = "📁" if path.is_dir() else "📄"
                 
-                print(f"  {path_type} {path} ({size_str})")
+                if path in self.generated_block_files:
+                    print(f"  {path_type} {path} (generated entries only)")
+                else:
+                    print(f"  {path_type} {path} ({size_str})")
                 category_items += 1
                 category_size += size
             
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Content Cache module
+Memoizes static payloads in-process and persists them in a versioned on-disk cache
+"""
+
+import functools
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+
+
+class ContentCache:
+    """marshal-backed cache of static payloads, keyed by a hash of the module that builds them"""
+
+    # Bump whenever the layout of the cache files changes
+    VERSION = 1
+
+    def __init__(self, cache_dir=None):
+        # Resolved once, so a later HOME override (batch output_root) does not move the cache
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_directory()
+        self.enabled = True
+        self._lock = threading.Lock()
+        # (module, name) -> (copy, payload); mutable payloads are kept marshalled and loaded per call
+        self._memory = {}
+        # module -> (cache file or None, {name: payload})
+        self._modules = {}
+
+    @staticmethod
+    def default_directory():
+        """Return the per-user cache directory of the project"""
+        if sys.platform == 'win32':
+            base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+            return Path(base) / 'A-K-DataTrap' / 'cache'
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return Path(base) / 'a-k-datatrap'
+
+    def _module_file(self, module):
+        """Return the cache file of a module, named after the hash of its source (None if unknown)"""
+        source_path = getattr(sys.modules.get(module), '__file__', None)
+        if not source_path:
+            return None
+        try:
+            with open(source_path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            return None
+        digest = hashlib.blake2b(source, digest_size=12)
+        digest.update(f"{self.VERSION}:{marshal.version}:{sys.version_info[:2]}".encode('ascii'))
+        return self.cache_dir / f"{module}-{digest.hexdigest()}.marshal"
+
+    def _load_module(self, module):
+        """Load the cached payloads of a module from disk once per process"""
+        entry = self._modules.get(module)
+        if entry is None:
+            path = self._module_file(module) if self.enabled else None
+            payloads = {}
+            if path is not None:
+                try:
+                    with open(path, 'rb') as f:
+                        payloads = marshal.load(f)
+                    if not isinstance(payloads, dict):
+                        payloads = {}
+                except (OSError, EOFError, ValueError, TypeError):
+                    payloads = {}
+            entry = self._modules[module] = (path, payloads)
+        return entry
+
+    def _store_module(self, module, path, payloads):
+        """Atomically rewrite the cache file of a module and drop files of older versions of it"""
+        import tempfile
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{module}-", suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump(payloads, f)
+            os.replace(temp_path, path)
+            for stale in self.cache_dir.glob(f"{module}-*.marshal"):
+                if stale != path:
+                    stale.unlink()
+        except OSError:
+            pass  # The in-process copy still serves this run
+
+    def get(self, module, name, build):
+        """Return the payload called name of module, calling build() only on a cold cache"""
+        key = (module, name)
+        entry = self._memory.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is None:
+                    path, payloads = self._load_module(module)
+                    if name not in payloads:
+                        payloads[name] = build()
+                        if path is not None:
+                            self._store_module(module, path, payloads)
+                    value = payloads[name]
+                    if isinstance(value, (str, bytes)):
+                        entry = (False, value)
+                    else:
+                        entry = (True, marshal.dumps(value))
+                    self._memory[key] = entry
+        copy, payload = entry
+        # Every caller gets its own copy of dicts and lists
+        return marshal.loads(payload) if copy else payload
+
+    def clear(self):
+        """Forget every payload in memory and remove the cache files"""
+        with self._lock:
+            self._memory.clear()
+            self._modules.clear()
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob('*.marshal'):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+
+CONTENT_CACHE = ContentCache()
+
+
+def static_content(func):
+    """Cache the result of a payload builder that ignores its arguments (such as self)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return CONTENT_CACHE.get(func.__module__, func.__qualname__, lambda: func(*args, **kwargs))
+    return wrapper
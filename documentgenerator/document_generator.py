@@ -4,16 +4,21 @@ Base Document Generator module
 Contains the abstract base class for document generation
 """
 
-from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+import hashlib
 import json
 import random
+import string
+from artifact_writer import ArtifactWriter
+from content_cache import static_content
+from os_detector import OSDetector
 
 
 class DocumentData:
     """Class to manage fake document data"""
     
     @staticmethod
+    @static_content
     def get_fake_documents():
         """Generate fake document data"""
         return {
@@ -247,6 +252,7 @@ Administrator,60000,15000,75000,3
         }
     
     @staticmethod
+    @static_content
     def get_document_templates():
         """Get document templates for different types"""
         return {
@@ -295,31 +301,203 @@ Recommendations:
 '''
         }
 
+    
+    @staticmethod
+    @static_content
+    def get_template_fields():
+        """Get the value pools used to fill the document templates"""
+        return {
+            'projects': ['Alpha', 'Atlas', 'Beacon', 'Cobalt', 'Delta', 'Everest', 'Falcon', 'Granite',
+                         'Horizon', 'Ion', 'Juniper', 'Keystone', 'Lighthouse', 'Meridian', 'Nova',
+                         'Orion', 'Phoenix', 'Quartz', 'Redwood', 'Summit', 'Titan', 'Vertex'],
+            'project_kinds': ['Migration', 'Platform', 'Rollout', 'Redesign', 'Integration', 'Modernization'],
+            'people': ['John Smith', 'Sarah Johnson', 'Mike Wilson', 'Emily Davis', 'David Brown',
+                       'Laura Martinez', 'James Taylor', 'Olivia Anderson', 'Daniel Thomas', 'Sophia Moore',
+                       'Robert Jackson', 'Emma White', 'William Harris', 'Ava Clark', 'Noah Lewis'],
+            'key_points': ['Q{quarter} targets exceeded by {percent}%', 'New client onboarding scheduled for {month}',
+                           'Budget allocation for next quarter approved', 'Team expansion of {small} engineers discussed',
+                           'Release {major}.{minor} slipped by {small} days', 'Customer satisfaction at {percent}%',
+                           'Vendor contract renewal under review', 'Security audit findings closed ({small} remaining)',
+                           'Infrastructure costs down {percent}% after migration', 'Hiring pipeline has {small} open roles'],
+            'tasks': ['Prepare quarterly report', 'Schedule client meeting', 'Review hiring requirements',
+                      'Update the project roadmap', 'Circulate budget draft', 'Book the offsite venue',
+                      'Finalize vendor shortlist', 'Write the release notes', 'Run the load test',
+                      'Collect team feedback'],
+            'overviews': ['Move the {kind_lower} workload to the new cloud region with no customer downtime.',
+                          'Deliver a unified {kind_lower} for internal teams by the end of {month}.',
+                          'Replace the legacy reporting stack and cut monthly costs by {percent}%.'],
+            'requirements': ['User authentication and authorization', 'Data processing and storage',
+                             'Real-time notifications', 'Reporting and analytics', 'Mobile compatibility',
+                             'Audit logging', 'Single sign-on', 'Automated backups', 'Role-based dashboards'],
+            'resources': ['Backend engineers', 'Frontend engineers', 'QA analysts', 'DevOps engineers',
+                          'Product designer', 'Project manager', 'Data analyst'],
+            'revenue_lines': ['Product sales', 'Service revenue', 'Subscriptions', 'Licensing', 'Consulting'],
+            'expense_lines': ['Personnel', 'Technology', 'Marketing', 'General & Admin', 'Facilities', 'Travel'],
+            'metrics': ['Customer Acquisition Cost', 'Customer Lifetime Value', 'Monthly Recurring Revenue',
+                        'Churn Rate', 'Gross Margin', 'Net Promoter Score'],
+            'recommendations': ['Increase marketing spend by {percent}%', 'Expand technical team',
+                                'Optimize operational processes', 'Explore new market opportunities',
+                                'Renegotiate cloud contracts', 'Consolidate vendor tooling']
+        }
+
+
+class DocumentTemplateEngine:
+    """Renders DocumentData templates with randomized field providers"""
+    
+    # Compiled templates shared by every engine: source -> (source, field names)
+    _compiled = {}
+    
+    def __init__(self, templates=None):
+        self.templates = templates or DocumentData.get_document_templates()
+        self.fields = DocumentData.get_template_fields()
+        self.providers = {
+            'title': self._title,
+            'date': lambda ctx: ctx['day'].strftime('%B %d, %Y'),
+            'attendees': lambda ctx: ', '.join(random.sample(self.fields['people'], random.randint(3, 6))),
+            'key_points': self._key_points,
+            'action_items': self._action_items,
+            'next_meeting': lambda ctx: (ctx['day'] + timedelta(days=7)).strftime('%B %d, %Y'),
+            'version': lambda ctx: f"{random.randint(1, 4)}.{random.randint(0, 9)}",
+            'overview': lambda ctx: self._fill(random.choice(self.fields['overviews']), ctx),
+            'requirements': self._requirements,
+            'timeline': self._timeline,
+            'resources': self._resources,
+            'period': lambda ctx: f"Q{(ctx['day'].month - 1) // 3 + 1} {ctx['day'].year}",
+            'revenue_data': lambda ctx: self._money_lines('revenue_lines', 150000, 2500000),
+            'expense_data': lambda ctx: self._money_lines('expense_lines', 50000, 1000000),
+            'metrics': self._metrics,
+            'recommendations': self._recommendations
+        }
+    
+    @classmethod
+    def compile(cls, source):
+        """Parse a template once and cache its field names"""
+        compiled = cls._compiled.get(source)
+        if compiled is None:
+            field_names = tuple(dict.fromkeys(
+                name for _, name, _, _ in string.Formatter().parse(source) if name
+            ))
+            compiled = cls._compiled[source] = (source, field_names)
+        return compiled
+    
+    def _context(self):
+        """Per-document values shared by the providers so related fields stay consistent"""
+        return {
+            'day': datetime.now() - timedelta(days=random.randint(0, 365)),
+            'kind': random.choice(self.fields['project_kinds'])
+        }
+    
+    def _fill(self, pattern, ctx):
+        """Substitute the small numeric placeholders used inside the value pools"""
+        return pattern.format(
+            quarter=random.randint(1, 4), percent=random.randint(3, 40), small=random.randint(2, 9),
+            major=random.randint(1, 5), minor=random.randint(0, 12),
+            month=(ctx['day'] + timedelta(days=random.randint(20, 90))).strftime('%B'),
+            kind_lower=ctx['kind'].lower()
+        )
+    
+    def _title(self, ctx):
+        """Project title such as 'Project Atlas Migration'"""
+        return f"Project {random.choice(self.fields['projects'])} {ctx['kind']}"
+    
+    def _key_points(self, ctx):
+        """Three to five bulleted discussion points"""
+        points = random.sample(self.fields['key_points'], random.randint(3, 5))
+        return '\n'.join(f"- {self._fill(point, ctx)}" for point in points)
+    
+    def _action_items(self, ctx):
+        """Bulleted tasks due shortly after the meeting"""
+        tasks = random.sample(self.fields['tasks'], random.randint(2, 4))
+        return '\n'.join(
+            f"- {task} (Due: {(ctx['day'] + timedelta(days=random.randint(2, 10))).strftime('%b %d')})"
+            for task in tasks
+        )
+    
+    def _requirements(self, ctx):
+        """Numbered list of project requirements"""
+        requirements = random.sample(self.fields['requirements'], random.randint(3, 6))
+        return '\n'.join(f"{number}. {requirement}" for number, requirement in enumerate(requirements, 1))
+    
+    def _timeline(self, ctx):
+        """Phases spaced six weeks apart from the document date"""
+        start = ctx['day']
+        return '\n'.join(
+            f"Phase {phase}: {(start + timedelta(days=45 * phase)).strftime('%B %Y')}"
+            for phase in range(1, random.randint(3, 5) + 1)
+        )
+    
+    def _resources(self, ctx):
+        """Roles with headcounts"""
+        roles = random.sample(self.fields['resources'], random.randint(2, 4))
+        return '\n'.join(f"- {role}: {random.randint(1, 6)}" for role in roles)
+    
+    def _money_lines(self, pool, low, high):
+        """Bulleted amounts from a pool of line items, followed by their total"""
+        lines = random.sample(self.fields[pool], random.randint(2, 4))
+        amounts = [random.randint(low, high) // 1000 * 1000 for _ in lines]
+        rows = [f"- {line}: ${amount:,}" for line, amount in zip(lines, amounts)]
+        rows.append(f"Total: ${sum(amounts):,}")
+        return '\n'.join(rows)
+    
+    def _metrics(self, ctx):
+        """Key metrics as percentages or dollar amounts"""
+        metrics = random.sample(self.fields['metrics'], random.randint(3, 5))
+        lines = []
+        for metric in metrics:
+            if metric in ('Churn Rate', 'Gross Margin'):
+                value = f"{random.uniform(1, 40):.1f}%"
+            elif metric == 'Net Promoter Score':
+                value = str(random.randint(10, 70))
+            else:
+                value = f"${random.randint(100, 250000):,}"
+            lines.append(f"- {metric}: {value}")
+        return '\n'.join(lines)
+    
+    def _recommendations(self, ctx):
+        """Numbered recommendations"""
+        recommendations = random.sample(self.fields['recommendations'], random.randint(2, 4))
+        return '\n'.join(f"{number}. {self._fill(item, ctx)}" for number, item in enumerate(recommendations, 1))
+    
+    def render(self, template_name):
+        """Render one document from a named template"""
+        source, field_names = self.compile(self.templates[template_name])
+        ctx = self._context()
+        return source.format_map({name: self.providers[name](ctx) for name in field_names})
+    
+    def render_many(self, count, template_names=None, max_attempts=10):
+        """Yield (template name, content) for up to count documents with unique content
+
+        A document that still repeats an earlier one after max_attempts
+        renders is skipped rather than written twice.
+        """
+        template_names = list(template_names or self.templates)
+        seen = set()
+        for index in range(count):
+            template_name = template_names[index % len(template_names)]
+            for _ in range(max_attempts):
+                content = self.render(template_name)
+                digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+                if digest not in seen:
+                    seen.add(digest)
+                    yield template_name, content
+                    break
+
 
 class DocumentGenerator:
     """Base class for document generation"""
     
     def __init__(self):
+        self.profile = OSDetector.get_profile()
         self.document_data = DocumentData.get_fake_documents()
         self.templates = DocumentData.get_document_templates()
         self.output_dir = self._get_documents_directory()
+        # Number of documents rendered from the templates on each run
+        self.template_document_count = 30
     
     def _get_documents_directory(self):
         """Get the default documents directory path for the current OS"""
-        home = Path.home()
-        # Try common document directories
-        possible_dirs = [
-            home / 'Documents',
-            home / 'My Documents',
-            home / 'Desktop'
-        ]
-        
-        for dir_path in possible_dirs:
-            if dir_path.exists():
-                return dir_path / 'Generated_Documents'
-        
-        # Fallback to home directory
-        return home / 'Generated_Documents'
+        # Documents, My Documents or Desktop, falling back to the home directory
+        return self.profile.documents_dir / 'Generated_Documents'
     
     def _create_output_directory(self):
         """Create the output directory if it doesn't exist"""
@@ -335,6 +513,15 @@ class DocumentGenerator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"{base_name}_{timestamp}{extension}"
     
+    def _write_template_documents(self):
+        """Render template_document_count unique documents into the output directory"""
+        engine = DocumentTemplateEngine(self.templates)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        writer = ArtifactWriter(self.output_dir)
+        for index, (template_name, content) in enumerate(engine.render_many(self.template_document_count), 1):
+            writer.add_file(f"{template_name.title()}_{timestamp}_{index:04d}.txt", content)
+        return writer.write()
+    
     def generate_documents(self):
         """Abstract method to be implemented by subclasses"""
         raise NotImplementedError("Subclasses must implement generate_documents method")
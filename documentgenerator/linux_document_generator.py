@@ -1,41 +1,30 @@
 #!/usr/bin/env python3
 """
 Linux Document Generator module
-Handles document generation for Linux systems using native tools and libraries
+Handles document generation for Linux systems using the in-process artifact writer
 """
 
-import os
-import subprocess
 import json
 import csv
-from pathlib import Path
 from datetime import datetime, timedelta
 import random
+from artifact_writer import ArtifactWriter
 from documentgenerator.document_generator import DocumentGenerator
 
 
 class LinuxDocumentGenerator(DocumentGenerator):
     """Document generator for Linux systems"""
     
-    def _create_bash_script(self):
-        """Create the bash script content for document generation"""
-        return '''#!/bin/bash
-
-# Document Generation Script for Linux
-# This script creates various types of fake documents
-
-DOCS_DIR="$HOME/Generated_Documents"
-TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
-
-# Create documents directory
-mkdir -p "$DOCS_DIR"
-
-echo "Creating fake documents in: $DOCS_DIR"
-
-# Create text documents
-cat > "$DOCS_DIR/Meeting_Notes_${TIMESTAMP}.txt" << 'EOF'
-Meeting Notes - Project Alpha
-Date: $(date +"%B %d, %Y")
+    def _get_native_documents(self, timestamp):
+        """Get the native Linux documents keyed by file name"""
+        now = datetime.now()
+        fields = {
+            'long_date': now.strftime("%B %d, %Y"),
+            'full_date': now.strftime("%a %b %d %H:%M:%S %Y")
+        }
+        return {
+            f'Meeting_Notes_{timestamp}.txt': '''Meeting Notes - Project Alpha
+Date: {long_date}
 Attendees: John Smith, Sarah Johnson, Mike Wilson
 
 Key Points:
@@ -50,12 +39,10 @@ Action Items:
 - Review hiring requirements (Due: Dec 22)
 
 Next Meeting: December 22, 2024
-EOF
-
-cat > "$DOCS_DIR/Project_Requirements_${TIMESTAMP}.txt" << 'EOF'
-Project Requirements Document
+'''.format(**fields),
+            f'Project_Requirements_{timestamp}.txt': '''Project Requirements Document
 Version: 1.2
-Last Updated: $(date +"%B %d, %Y")
+Last Updated: {long_date}
 
 Project Overview:
 The goal is to develop a comprehensive system that meets the following requirements:
@@ -84,21 +71,15 @@ Timeline:
 Phase 1: January 2025
 Phase 2: March 2025
 Phase 3: May 2025
-EOF
-
-# Create CSV file
-cat > "$DOCS_DIR/Budget_Analysis_${TIMESTAMP}.csv" << 'EOF'
-Department,Allocated,Spent,Remaining,Percentage
+'''.format(**fields),
+            f'Budget_Analysis_{timestamp}.csv': '''Department,Allocated,Spent,Remaining,Percentage
 Engineering,500000,485000,15000,97%
 Marketing,300000,275000,25000,92%
 Sales,400000,390000,10000,98%
 Operations,250000,235000,15000,94%
 HR,150000,145000,5000,97%
-EOF
-
-# Create JSON configuration file
-cat > "$DOCS_DIR/System_Config_${TIMESTAMP}.json" << 'EOF'
-{
+''',
+            f'System_Config_{timestamp}.json': '''{
   "application": {
     "name": "Enterprise System",
     "version": "2.1.0",
@@ -122,25 +103,22 @@ cat > "$DOCS_DIR/System_Config_${TIMESTAMP}.json" << 'EOF'
     "request_timeout": 30
   }
 }
-EOF
-
-# Create HTML report
-cat > "$DOCS_DIR/System_Report_${TIMESTAMP}.html" << 'EOF'
-<!DOCTYPE html>
+''',
+            f'System_Report_{timestamp}.html': '''<!DOCTYPE html>
 <html>
 <head>
     <title>System Performance Report</title>
     <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        table { border-collapse: collapse; width: 100%; }
-        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-        th { background-color: #f2f2f2; }
-        .metric { background-color: #e8f5e8; }
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+        .metric {{ background-color: #e8f5e8; }}
     </style>
 </head>
 <body>
     <h1>System Performance Report</h1>
-    <p>Generated on: $(date)</p>
+    <p>Generated on: {full_date}</p>
     
     <h2>Performance Metrics</h2>
     <table>
@@ -180,11 +158,8 @@ cat > "$DOCS_DIR/System_Report_${TIMESTAMP}.html" << 'EOF'
     </ul>
 </body>
 </html>
-EOF
-
-# Create Markdown documentation
-cat > "$DOCS_DIR/API_Documentation_${TIMESTAMP}.md" << 'EOF'
-# API Documentation
+'''.format(**fields),
+            f'API_Documentation_{timestamp}.md': '''# API Documentation
 
 ## Overview
 This document describes the REST API endpoints for the Enterprise System.
@@ -249,11 +224,8 @@ Creates a new project.
 
 ## Rate Limiting
 API requests are limited to 1000 requests per hour per user.
-EOF
-
-# Create shell script
-cat > "$DOCS_DIR/deploy_script_${TIMESTAMP}.sh" << 'EOF'
-#!/bin/bash
+''',
+            f'deploy_script_{timestamp}.sh': '''#!/bin/bash
 # Deployment Script
 # Version: 1.0
 
@@ -296,13 +268,8 @@ else
 fi
 
 echo "Deployment completed at $(date)"
-EOF
-
-chmod +x "$DOCS_DIR/deploy_script_${TIMESTAMP}.sh"
-
-# Create log file
-cat > "$DOCS_DIR/application_log_${TIMESTAMP}.log" << 'EOF'
-[2024-12-12 10:00:01] INFO: Application started
+''',
+            f'application_log_{timestamp}.log': '''[2024-12-12 10:00:01] INFO: Application started
 [2024-12-12 10:00:02] INFO: Database connection established
 [2024-12-12 10:00:03] INFO: Cache initialized
 [2024-12-12 10:15:23] INFO: User login: john.doe
@@ -315,14 +282,18 @@ cat > "$DOCS_DIR/application_log_${TIMESTAMP}.log" << 'EOF'
 [2024-12-12 11:15:45] ERROR: Connection timeout to external service
 [2024-12-12 11:16:00] INFO: Retry successful
 [2024-12-12 12:00:00] INFO: Daily statistics generated
-EOF
-
-echo "✅ Document generation completed!"
-echo "Generated files:"
-find "$DOCS_DIR" -name "*${TIMESTAMP}*" -type f
-echo ""
-echo "Total files created: $(find "$DOCS_DIR" -name "*${TIMESTAMP}*" -type f | wc -l)"
 '''
+        }
+    
+    def _write_native_documents(self):
+        """Write the native Linux documents in-process and return the written paths"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        writer = ArtifactWriter(self.profile.home / 'Generated_Documents')
+        for file_name, content in self._get_native_documents(timestamp).items():
+            # Shell scripts are made executable like the original chmod +x
+            mode = 0o755 if file_name.endswith('.sh') else 0o644
+            writer.add_file(file_name, content, mode)
+        return writer.write()
     
     def _generate_python_documents(self):
         """Generate documents using Python libraries"""
@@ -400,41 +371,13 @@ echo "Total files created: $(find "$DOCS_DIR" -name "*${TIMESTAMP}*" -type f | w
         """Execute document generation on Linux"""
         print("Generating documents using Linux native tools...")
         
-        # First, try to generate using bash script
-        script_content = self._create_bash_script()
-        script_path = '/tmp/generate_documents.sh'
-        
         try:
-            # Write script to file
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-            
-            # Make script executable
-            os.chmod(script_path, 0o755)
-            
-            # Execute script
-            result = subprocess.run(['bash', script_path], capture_output=True, text=True)
-            
-            # Also generate documents using Python for additional formats
-            python_success = self._generate_python_documents()
+            # First, write the native documents in-process
+            written = self._write_native_documents()
             
-            # Combine results
-            if result.returncode == 0 or python_success:
-                combined_stdout = result.stdout
-                if python_success:
-                    combined_stdout += "\n✅ Additional Python-generated documents created successfully!"
-                
-                return type('Result', (), {
-                    'returncode': 0,
-                    'stdout': combined_stdout,
-                    'stderr': result.stderr
-                })()
-            else:
-                return result
-            
-        except Exception as e:
+        except OSError as e:
             # Fallback to Python-only generation
-            print(f"Bash script failed, falling back to Python generation: {e}")
+            print(f"Native document writing failed, falling back to Python generation: {e}")
             if self._generate_python_documents():
                 return type('Result', (), {
                     'returncode': 0,
@@ -448,7 +391,29 @@ echo "Total files created: $(find "$DOCS_DIR" -name "*${TIMESTAMP}*" -type f | w
                     'stderr': f'Document generation failed: {e}'
                 })()
         
-        finally:
-            # Clean up script file if it exists
-            if os.path.exists(script_path):
-                os.remove(script_path)
\ No newline at end of file
+        # Also generate documents using Python for additional formats
+        python_success = self._generate_python_documents()
+        
+        # Render unique documents from the meeting notes, project plan and financial report templates
+        try:
+            rendered = self._write_template_documents()
+        except OSError as e:
+            print(f"Warning: Could not write template documents: {e}")
+            rendered = []
+        
+        docs_dir = self.profile.home / 'Generated_Documents'
+        combined_stdout = f"Creating fake documents in: {docs_dir}\n"
+        combined_stdout += "✅ Document generation completed!\n"
+        combined_stdout += "Generated files:\n"
+        combined_stdout += "".join(f"{path}\n" for path in written)
+        combined_stdout += f"\nTotal files created: {len(written)}\n"
+        if python_success:
+            combined_stdout += "\n✅ Additional Python-generated documents created successfully!"
+        if rendered:
+            combined_stdout += f"\n✅ {len(rendered)} template documents rendered in: {self.output_dir}"
+        
+        return type('Result', (), {
+            'returncode': 0,
+            'stdout': combined_stdout,
+            'stderr': ''
+        })()
\ No newline at end of file
@@ -11,12 +11,14 @@ import os
 from pathlib import Path
 from datetime import datetime, timedelta
 import random
+from content_cache import static_content
 from documentgenerator.document_generator import DocumentGenerator
 
 
 class WindowsDocumentGenerator(DocumentGenerator):
     """Document generator for Windows systems"""
     
+    @static_content
     def _create_powershell_script(self):
         """Create the PowerShell script content for document generation"""
         return '''# Document Generation Script for Windows
@@ -494,6 +496,9 @@ January 15, 2025: Project Alpha - Phase 1 completion
 February 1, 2025: Project Gamma - Design review
 ''')
             
+            # Render unique documents from the meeting notes, project plan and financial report templates
+            self._write_template_documents()
+            
             return True
             
         except Exception as e:
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Generator Registry module
+Describes every artifact generator as a plugin and discovers third-party plugins through entry points
+"""
+
+import hashlib
+import importlib
+import os
+import sys
+from content_cache import CONTENT_CACHE
+from os_detector import OSDetector
+
+
+class GeneratorPlugin:
+    """Capability metadata of one artifact type and the generator classes implementing it"""
+
+    def __init__(self, key, name, menu_label, implementations, run_method, settings=None,
+                 estimated_cost=1.0, interactive=False, features=None, feature_label=None):
+        # Identifier used by manifests, e.g. 'ssh_keys'
+        self.key = key
+        # Operation name used in results and reports, e.g. 'SSH Key Generation'
+        self.name = name
+        self.menu_label = menu_label
+        # Platform ('linux', 'windows') -> 'module:Class' path, imported only when created
+        self.implementations = dict(implementations)
+        self.run_method = run_method
+        # Manifest counts key -> generator attribute it sets (as an int)
+        self.settings = dict(settings or {})
+        # Relative run time, used to start the longest operations first
+        self.estimated_cost = estimated_cost
+        # Interactive generators may prompt, so they run on the main thread and take assume_yes
+        self.interactive = interactive
+        # Supported variants shown in the banner, optionally per platform
+        self.features = features
+        self.feature_label = feature_label
+
+    @property
+    def platforms(self):
+        """Return the platforms this plugin has an implementation for"""
+        return list(self.implementations)
+
+    def supports(self, system):
+        """Check if the plugin has an implementation for a platform"""
+        return system in self.implementations
+
+    def features_for(self, system):
+        """Return the banner features of a platform"""
+        if isinstance(self.features, dict):
+            return self.features.get(system, [])
+        return self.features or []
+
+    def create(self, system, counts=None):
+        """Import and instantiate the implementation for a platform, applying manifest counts"""
+        if not self.supports(system):
+            raise OSError(f"{self.name} does not support {system}")
+        module_name, _, class_name = self.implementations[system].partition(':')
+        generator = getattr(importlib.import_module(module_name), class_name)()
+        for count_key, attribute in self.settings.items():
+            if counts and count_key in counts:
+                setattr(generator, attribute, int(counts[count_key]))
+        return generator
+
+    def run(self, generator, assume_yes=False):
+        """Run the generator and return its result object"""
+        method = getattr(generator, self.run_method)
+        if self.interactive:
+            return method(assume_yes=assume_yes)
+        return method()
+
+
+BUILTIN_PLUGINS = [
+    GeneratorPlugin(
+        'ssh_keys', "SSH Key Generation", "Generate SSH Keys",
+        {'linux': 'sshkeygenerator.linux_generator:LinuxSSHKeyGenerator',
+         'windows': 'sshkeygenerator.windows_generator:WindowsSSHKeyGenerator'},
+        'generate_keys', estimated_cost=2.0,
+        settings={'known_hosts': 'known_host_count', 'ssh_config_hosts': 'config_host_count',
+                  'authorized_keys': 'authorized_key_count'}
+    ),
+    GeneratorPlugin(
+        'web_history', "Web History Injection", "Inject Web History",
+        {'linux': 'webhistory.linux_history_injector:LinuxWebHistoryInjector',
+         'windows': 'webhistory.windows_history_injector:WindowsWebHistoryInjector'},
+        'inject_history', settings={'web_history': 'visit_count'}, estimated_cost=5.0, interactive=True,
+        features=['Chrome', 'Firefox', 'Edge', 'Brave', 'Opera', 'Internet Explorer'], feature_label='browsers'
+    ),
+    GeneratorPlugin(
+        'documents', "Document Generation", "Generate Documents",
+        {'linux': 'documentgenerator.linux_document_generator:LinuxDocumentGenerator',
+         'windows': 'documentgenerator.windows_document_generator:WindowsDocumentGenerator'},
+        'generate_documents', settings={'documents': 'template_document_count'}, estimated_cost=3.0,
+        features=['txt', 'csv', 'json', 'html', 'md', 'log', 'ps1', 'sh'], feature_label='document formats'
+    ),
+    GeneratorPlugin(
+        'api_keys', "API Key Generation", "Generate API Keys",
+        {'linux': 'apikeygenerator.linux_generator:LinuxAPIKeyGenerator',
+         'windows': 'apikeygenerator.windows_generator:WindowsAPIKeyGenerator'},
+        'generate_keys', estimated_cost=1.0
+    ),
+    GeneratorPlugin(
+        'source_code', "Source Code Generation", "Generate Source Code",
+        {'linux': 'sourcecodegenerator.linux_code_generator:LinuxSourceCodeGenerator',
+         'windows': 'sourcecodegenerator.windows_code_generator:WindowsSourceCodeGenerator'},
+        'generate_source_code', estimated_cost=1.0,
+        features=['Python', 'JavaScript', 'Java', 'C++', 'C', 'Bash/PowerShell', 'C#'],
+        feature_label='programming languages'
+    ),
+    GeneratorPlugin(
+        'logs', "Log Generation", "Generate Logs",
+        {'linux': 'loggenerator.linux_generator:LinuxLogGenerator',
+         'windows': 'loggenerator.windows_generator:WindowsLogGenerator'},
+        'generate_logs', estimated_cost=10.0,
+        settings={'logs': 'target_lines', 'log_bytes': 'target_bytes', 'log_rotations': 'rotations',
+                  'login_records': 'login_sessions', 'event_records': 'event_records'},
+        features={
+            'linux': ['Apache Access Log', 'System Log (syslog)', 'Authentication Log', 'Nginx Error Log',
+                      'Application Log', 'Kernel Log'],
+            'windows': ['IIS Access Log', 'Windows Event Log', 'PowerShell Execution Log', 'SQL Server Error Log',
+                        'Application Log', 'Performance CSV']
+        },
+        feature_label='log types'
+    )
+]
+
+
+class GeneratorRegistry:
+    """Ordered set of generator plugins: the built-in ones plus any installed through entry points"""
+
+    # Distributions register plugins under this entry point group; each entry
+    # point loads a GeneratorPlugin, a list of them, or a callable returning either
+    ENTRY_POINT_GROUP = 'a_k_datatrap.generators'
+
+    def __init__(self, plugins=BUILTIN_PLUGINS, discover=True):
+        self._plugins = {}
+        self._discover = discover
+        self._discovered = False
+        for plugin in plugins:
+            self.register(plugin)
+
+    @property
+    def system(self):
+        """Return the running platform"""
+        return OSDetector.get_system()
+
+    def register(self, plugin):
+        """Add a plugin, replacing any plugin with the same key"""
+        self._plugins[plugin.key] = plugin
+
+    @staticmethod
+    def _path_signature():
+        """Fingerprint of the import path; installing or removing a distribution changes a directory mtime"""
+        parts = []
+        for entry in sys.path:
+            try:
+                parts.append(f"{entry}:{os.stat(entry or '.').st_mtime_ns}")
+            except OSError:
+                continue
+        return hashlib.blake2b('\n'.join(parts).encode('utf-8'), digest_size=8).hexdigest()
+
+    @classmethod
+    def _scan_entry_points(cls):
+        """Return [name, 'module:attribute'] of every entry point in the group"""
+        # importlib.metadata is slow to import, so it is only loaded on a cold cache
+        from importlib.metadata import entry_points
+        try:
+            selected = entry_points(group=cls.ENTRY_POINT_GROUP)
+        except TypeError:  # Python < 3.10
+            selected = entry_points().get(cls.ENTRY_POINT_GROUP, [])
+        return [[entry_point.name, entry_point.value] for entry_point in selected]
+
+    def discover(self):
+        """Register the plugins of installed distributions once; broken plugins are reported and skipped"""
+        if self._discovered or not self._discover:
+            return
+        self._discovered = True
+        entry_points = CONTENT_CACHE.get(__name__, f"entry_points:{self._path_signature()}", self._scan_entry_points)
+        for name, value in entry_points:
+            try:
+                module_name, _, attribute_path = value.partition(':')
+                loaded = importlib.import_module(module_name.strip())
+                for attribute in filter(None, attribute_path.strip().split('.')):
+                    loaded = getattr(loaded, attribute)
+                if callable(loaded) and not isinstance(loaded, GeneratorPlugin):
+                    loaded = loaded()
+                for plugin in loaded if isinstance(loaded, (list, tuple)) else [loaded]:
+                    if not isinstance(plugin, GeneratorPlugin):
+                        raise TypeError(f"expected a GeneratorPlugin, got {type(plugin).__name__}")
+                    self.register(plugin)
+            except Exception as e:
+                print(f"⚠ Skipping generator plugin '{name}' ({value}): {e}", file=sys.stderr)
+
+    def plugins(self):
+        """Return every plugin available on the running platform, built-ins first"""
+        self.discover()
+        return [plugin for plugin in self._plugins.values() if plugin.supports(self.system)]
+
+    def get(self, key):
+        """Return the plugin registered under key"""
+        plugin = self._plugins.get(key)
+        if plugin is None:
+            self.discover()
+            plugin = self._plugins.get(key)
+        if plugin is None:
+            raise KeyError(f"Unknown generator '{key}'")
+        return plugin
+
+    def create(self, key, counts=None):
+        """Create the generator of a plugin for the running platform"""
+        return self.get(key).create(self.system, counts)
+
+    def supported_systems(self):
+        """Return the display names of every platform some plugin supports"""
+        systems = []
+        for plugin in self._plugins.values():
+            for system in plugin.platforms:
+                if system not in systems:
+                    systems.append(system)
+        return [system.capitalize() for system in systems]
+
+    @staticmethod
+    def plan(plugins):
+        """Order plugins for a worker pool: the most expensive start first"""
+        return sorted(plugins, key=lambda plugin: plugin.estimated_cost, reverse=True)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Honeytoken Registry module
+Records which generated secret was issued to which host, so a detection event can be attributed
+"""
+
+import hashlib
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+
+class Honeytoken(namedtuple('Honeytoken', ['kind', 'host', 'issued_at', 'location', 'hint'])):
+    """One issued secret: its type, the host and time it was issued, the file it was written to and its first characters"""
+
+    __slots__ = ()
+
+
+def fingerprint(token):
+    """Return the 16-byte key a secret is stored under; the registry never holds the secret itself"""
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+
+class HoneytokenRegistry:
+    """SQLite table of issued secrets keyed by their fingerprint
+
+    The table is a WITHOUT ROWID primary-key index on the fingerprint, so a
+    lookup is a single index probe however many millions of secrets are
+    recorded. Entries are only ever inserted; every generator run adds its
+    secrets in one transaction.
+    """
+
+    # Characters of the secret kept readable, enough to tell formats apart
+    HINT_LENGTH = 8
+    # Points the registry outside the decoy account, e.g. at a share of the monitoring host
+    PATH_VARIABLE = 'A_K_DATATRAP_REGISTRY'
+    SCHEMA = '''CREATE TABLE IF NOT EXISTS honeytokens (
+    fingerprint BLOB PRIMARY KEY,
+    kind TEXT NOT NULL,
+    host TEXT NOT NULL,
+    issued_at REAL NOT NULL,
+    location TEXT,
+    hint TEXT
+) WITHOUT ROWID'''
+
+    def __init__(self, path=None):
+        # Resolved once, so a later HOME override (batch output_root) does not move the registry into a decoy home
+        self.path = Path(path) if path else self.default_path()
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path():
+        """Return the registry file named by A_K_DATATRAP_REGISTRY, else the per-user file of the project"""
+        configured = os.environ.get(HoneytokenRegistry.PATH_VARIABLE)
+        if configured:
+            return Path(configured).expanduser().resolve()
+        if sys.platform == 'win32':
+            base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+            return Path(base) / 'A-K-DataTrap' / 'honeytokens.sqlite3'
+        base = os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share'
+        return Path(base) / 'a-k-datatrap' / 'honeytokens.sqlite3'
+
+    def _connect(self):
+        """Open (creating it on first use) the registry database; the caller holds the lock"""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Only the owner may read which secrets are honeytokens; SQLite gives its journal files the same mode
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            # Several deployments may record at the same time; writers wait for each other
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            try:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+                connection.execute(self.SCHEMA)
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def record(self, entries, host=None, issued_at=None):
+        """Record (kind, secret, location) entries issued to host; returns the number of new entries"""
+        host = host or socket.gethostname()
+        issued_at = time.time() if issued_at is None else issued_at
+        rows = [(fingerprint(token), kind, host, issued_at, location, token[:self.HINT_LENGTH])
+                for kind, token, location in entries]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('BEGIN IMMEDIATE')
+                before = connection.total_changes
+                # A secret keeps the attribution of its first issue
+                connection.executemany('INSERT OR IGNORE INTO honeytokens VALUES (?, ?, ?, ?, ?, ?)', rows)
+                return connection.total_changes - before
+
+    def lookup(self, token):
+        """Return the Honeytoken a secret was issued as, or None if it was never issued here"""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT kind, host, issued_at, location, hint FROM honeytokens WHERE fingerprint = ?',
+                (fingerprint(token),)
+            ).fetchone()
+        return Honeytoken(*row) if row else None
+
+    def relocate(self, path):
+        """Record to the registry file at path from now on"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self.path = Path(path).expanduser().resolve()
+
+    def count(self):
+        """Return the number of recorded secrets"""
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM honeytokens').fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def register_issued(result, entries, registry=None):
+    """Record the secrets of a successful generator run; a registry failure becomes a warning in its output"""
+    if result.returncode != 0 or not entries:
+        return result
+    registry = registry or HONEYTOKEN_REGISTRY
+    try:
+        registry.record(entries)
+    except (sqlite3.Error, OSError) as e:
+        result.stdout += f"⚠ Could not record the issued secrets in {registry.path}: {e}\n"
+    return result
+
+
+HONEYTOKEN_REGISTRY = HoneytokenRegistry()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+EVTX Writer module
+Writes Windows event logs in the EVTX chunk format in pure Python
+"""
+
+import binascii
+import os
+import struct
+import time
+import uuid
+from loggenerator.field_batch import FieldBatch
+from loggenerator.log_formats import WindowsEventFormat
+
+
+# Binary XML tokens
+FRAGMENT_HEADER = b'\x0f\x01\x01\x00'
+OPEN_START_ELEMENT = 0x01
+OPEN_START_ELEMENT_ATTRIBUTES = 0x41
+CLOSE_START_ELEMENT = 0x02
+CLOSE_EMPTY_ELEMENT = 0x03
+END_ELEMENT = 0x04
+VALUE = 0x05
+ATTRIBUTE = 0x06
+ATTRIBUTE_MORE = 0x46
+TEMPLATE_INSTANCE = 0x0c
+NORMAL_SUBSTITUTION = 0x0d
+END_OF_STREAM = 0x00
+
+# Substitution value types
+WSTRING = 0x01
+UINT32 = 0x08
+UINT64 = 0x0a
+FILETIME = 0x11
+
+# Seconds between 1601-01-01 (FILETIME epoch) and 1970-01-01
+FILETIME_EPOCH = 11644473600
+
+EVENT_NAMESPACE = 'http://schemas.microsoft.com/win/2004/08/events/event'
+
+# Substitutions shared by every template, in the order of the record's value array
+SYSTEM_TIME, RECORD_ID, PROCESS_ID, THREAD_ID = range(4)
+SYSTEM_TYPES = (FILETIME, UINT64, UINT32, UINT32)
+
+
+class Substitution:
+    """Placeholder of a template value filled in by every record"""
+
+    __slots__ = ('index', 'value_type')
+
+    def __init__(self, index, value_type):
+        self.index = index
+        self.value_type = value_type
+
+
+def element(name, attributes=(), content=None):
+    """Describe a template element; content is a list of elements, a string or a Substitution"""
+    return name, tuple(attributes), content
+
+
+def name_hash(name):
+    """Hash of an element or attribute name as stored in the chunk string table"""
+    value = 0
+    for char in name.encode('utf-16-le')[::2]:
+        value = (value * 65599 + char) & 0xFFFFFFFF
+    return value & 0xFFFF
+
+
+class EvtxChunk:
+    """One 64 KiB chunk holding records, their templates and the shared name strings"""
+
+    SIZE = 0x10000
+    HEADER_SIZE = 0x200
+    EMPTY = bytes(SIZE)
+
+    def __init__(self):
+        self.data = bytearray(self.SIZE)
+        self.reset()
+
+    def reset(self):
+        """Empty the chunk for reuse"""
+        self.data[:] = self.EMPTY
+        self.free = self.HEADER_SIZE
+        self.first_record = None
+        self.last_record = None
+        self.last_offset = 0
+        self.names = {}
+        self.string_heads = [0] * 64
+        self.templates = {}
+        self.template_heads = [0] * 32
+
+    def _name(self, out, base, name, names, heads):
+        """Reference a name, storing it inline the first time it appears in the chunk"""
+        offset = names.get(name)
+        if offset is not None:
+            out += struct.pack('<I', offset)
+            return
+        offset = base + len(out) + 4
+        name_value = name_hash(name)
+        bucket = name_value % 64
+        out += struct.pack('<IIHH', offset, heads[bucket], name_value, len(name))
+        out += name.encode('utf-16-le') + b'\x00\x00'
+        heads[bucket] = offset
+        names[name] = offset
+
+    def _value(self, out, value):
+        """Append a literal string or a substitution token"""
+        if isinstance(value, Substitution):
+            out += struct.pack('<BHB', NORMAL_SUBSTITUTION, value.index, value.value_type)
+        else:
+            out += struct.pack('<BBH', VALUE, WSTRING, len(value)) + value.encode('utf-16-le')
+
+    def _element(self, out, base, node, names, heads):
+        """Append an element and its children as binary XML"""
+        name, attributes, content = node
+        out.append(OPEN_START_ELEMENT_ATTRIBUTES if attributes else OPEN_START_ELEMENT)
+        out += b'\xff\xff'
+        size_at = len(out)
+        out += bytes(4)
+        self._name(out, base, name, names, heads)
+        if attributes:
+            list_at = len(out)
+            out += bytes(4)
+            for index, (attribute, value) in enumerate(attributes):
+                out.append(ATTRIBUTE_MORE if index < len(attributes) - 1 else ATTRIBUTE)
+                self._name(out, base, attribute, names, heads)
+                self._value(out, value)
+            struct.pack_into('<I', out, list_at, len(out) - list_at - 4)
+        if content is None:
+            out.append(CLOSE_EMPTY_ELEMENT)
+        else:
+            out.append(CLOSE_START_ELEMENT)
+            if isinstance(content, list):
+                for child in content:
+                    self._element(out, base, child, names, heads)
+            else:
+                self._value(out, content)
+            out.append(END_ELEMENT)
+        struct.pack_into('<I', out, size_at, len(out) - size_at - 4)
+
+    def _template(self, base, definition, names, heads):
+        """Return the resident template definition of an event stored at chunk offset base"""
+        out = bytearray()
+        out += struct.pack('<I', self.template_heads[definition.template_id % 32])
+        out += definition.guid.bytes_le
+        out += bytes(4)
+        out += FRAGMENT_HEADER
+        self._element(out, base, definition.tree, names, heads)
+        out.append(END_OF_STREAM)
+        struct.pack_into('<I', out, 20, len(out) - 24)
+        return out
+
+    def append(self, record_id, filetime, definition, values):
+        """Append one event record; returns False when the chunk has no room left"""
+        start = self.free
+        template_offset = self.templates.get(definition.key)
+        resident = template_offset is None
+        names, heads = self.names, self.string_heads
+        if resident:
+            # Names and templates are only committed once the record is known to fit
+            names, heads = dict(names), list(heads)
+            template_offset = start + 24 + len(FRAGMENT_HEADER) + 10
+            template = self._template(template_offset, definition, names, heads)
+        else:
+            template = b''
+
+        descriptors = bytearray(struct.pack('<I', len(values)))
+        for value_type, value in zip(definition.value_types, values):
+            descriptors += struct.pack('<HBx', len(value), value_type)
+        size = 24 + len(FRAGMENT_HEADER) + 10 + len(template) + len(descriptors) + sum(map(len, values)) + 4
+        if start + size > self.SIZE:
+            return False
+
+        record = bytearray(struct.pack('<IIQQ', 0x00002a2a, size, record_id, filetime))
+        record += FRAGMENT_HEADER
+        record += struct.pack('<BBII', TEMPLATE_INSTANCE, 1, definition.template_id, template_offset)
+        record += template
+        record += descriptors
+        record += b''.join(values)
+        record += struct.pack('<I', size)
+        self.data[start:start + size] = record
+
+        if resident:
+            self.names, self.string_heads = names, heads
+            self.templates[definition.key] = template_offset
+            self.template_heads[definition.template_id % 32] = template_offset
+        if self.first_record is None:
+            self.first_record = record_id
+        self.last_record = record_id
+        self.last_offset = start
+        self.free = start + size
+        return True
+
+    def finish(self):
+        """Fill in the chunk header and checksums and return the chunk bytes"""
+        data = self.data
+        struct.pack_into('<8sQQQQIIII', data, 0, b'ElfChnk\x00', self.first_record, self.last_record,
+                         self.first_record, self.last_record, 0x80, self.last_offset, self.free,
+                         binascii.crc32(data[self.HEADER_SIZE:self.free]))
+        struct.pack_into('<64I', data, 0x80, *self.string_heads)
+        struct.pack_into('<32I', data, 0x180, *self.template_heads)
+        checksum = binascii.crc32(data[0x80:self.HEADER_SIZE], binascii.crc32(data[:0x78]))
+        struct.pack_into('<I', data, 0x7c, checksum)
+        return data
+
+
+class EventDefinition:
+    """One event type of a channel and the template its records share"""
+
+    def __init__(self, channel, hostname, provider, event_id, level, data, weight=1, guid=None,
+                 qualifiers=None, version=0, task=0, opcode=0, keywords=0x8000000000000000, user_id=None):
+        self.channel = channel
+        self.event_id = event_id
+        self.weight = weight
+        self.data = [template for _, template in data]
+        self.value_types = SYSTEM_TYPES + (WSTRING,) * len(data)
+        self.key = (channel, provider, event_id)
+        # The template GUID identifies the template; its first four bytes double as the template id
+        self.guid = uuid.uuid5(uuid.NAMESPACE_URL, f"evtx:{hostname}/{channel}/{provider}/{event_id}")
+        self.template_id = struct.unpack_from('<I', self.guid.bytes_le)[0]
+
+        provider_attributes = [('Name', provider)] + ([('Guid', guid)] if guid else [])
+        event_id_attributes = [('Qualifiers', str(qualifiers))] if qualifiers is not None else []
+        security_attributes = [('UserID', user_id)] if user_id else []
+        event_data = [
+            element('Data', [('Name', name)] if name else [], Substitution(len(SYSTEM_TYPES) + index, WSTRING))
+            for index, (name, _) in enumerate(data)
+        ]
+        self.tree = element('Event', [('xmlns', EVENT_NAMESPACE)], [
+            element('System', content=[
+                element('Provider', provider_attributes),
+                element('EventID', event_id_attributes, str(event_id)),
+                element('Version', content=str(version)),
+                element('Level', content=str(level)),
+                element('Task', content=str(task)),
+                element('Opcode', content=str(opcode)),
+                element('Keywords', content=f"0x{keywords:x}"),
+                element('TimeCreated', [('SystemTime', Substitution(SYSTEM_TIME, FILETIME))]),
+                element('EventRecordID', content=Substitution(RECORD_ID, UINT64)),
+                element('Correlation'),
+                element('Execution', [('ProcessID', Substitution(PROCESS_ID, UINT32)),
+                                      ('ThreadID', Substitution(THREAD_ID, UINT32))]),
+                element('Channel', content=channel),
+                element('Computer', content=hostname),
+                element('Security', security_attributes)
+            ]),
+            element('EventData', content=event_data)
+        ])
+
+
+class EvtxWriter:
+    """Streams event records of one channel into an EVTX file through a reused chunk buffer"""
+
+    # Records generated per block of columns
+    BLOCK_RECORDS = 4096
+
+    # Size of the userspace write buffer of the output file
+    BUFFER_SIZE = 1024 * 1024
+
+    FILE_HEADER_SIZE = 0x1000
+
+    # The file header counts chunks in 16 bits
+    MAX_CHUNKS = 0xFFFF
+
+    CHANNELS = ('Application', 'Security', 'System')
+
+    SECURITY_GUID = '{54849625-5478-4994-A5BA-3E3B0328C30D}'
+    SERVICES = [('Windows Update', 'running'), ('Windows Update', 'stopped'), ('Background Intelligent Transfer Service', 'running'),
+                ('Windows Modules Installer', 'running'), ('Windows Modules Installer', 'stopped'),
+                ('Microsoft Store Install Service', 'running'), ('WinHTTP Web Proxy Auto-Discovery Service', 'stopped')]
+    APPLICATIONS = [('chrome.exe', '114.0.5735.199'), ('OUTLOOK.EXE', '16.0.16529.20154'), ('explorer.exe', '10.0.19041.3086'),
+                    ('Teams.exe', '1.6.0.18681'), ('sqlservr.exe', '2019.150.4312.2')]
+
+    def __init__(self, hostname, username, history_days=90, end_time=None):
+        self.hostname = hostname
+        self.username = username
+        self.history_days = history_days
+        self.end_time = end_time
+        self.fields = FieldBatch()
+        self._definitions = {}
+
+    def _event_definitions(self, channel):
+        """Return the event definitions of a channel, matching the windows_events.log text entries"""
+        definitions = self._definitions.get(channel)
+        if definitions is not None:
+            return definitions
+        host = self.hostname
+        security = dict(provider='Microsoft-Windows-Security-Auditing', guid=self.SECURITY_GUID, level=0, task=12544)
+        events = {
+            'Security': [
+                dict(security, event_id=4624, version=2, keywords=0x8020000000000000, weight=6, data=[
+                    ('SubjectUserSid', 'S-1-5-18'), ('SubjectUserName', '{computer}$'), ('SubjectDomainName', 'WORKGROUP'),
+                    ('SubjectLogonId', '0x3e7'), ('TargetUserSid', '{user_sid}'), ('TargetUserName', '{username}'),
+                    ('TargetDomainName', '{computer}'), ('TargetLogonId', '{logon_id}'), ('LogonType', '{logon_type}'),
+                    ('LogonProcessName', 'User32 '), ('AuthenticationPackageName', 'Negotiate'),
+                    ('WorkstationName', '{computer}'), ('ProcessName', 'C:\\Windows\\System32\\svchost.exe'),
+                    ('IpAddress', '{ip}'), ('IpPort', '{port}')
+                ]),
+                dict(security, event_id=4672, task=12548, keywords=0x8020000000000000, weight=3, data=[
+                    ('SubjectUserSid', '{user_sid}'), ('SubjectUserName', '{username}'),
+                    ('SubjectDomainName', '{computer}'), ('SubjectLogonId', '{logon_id}'),
+                    ('PrivilegeList', 'SeSecurityPrivilege\n\t\t\tSeBackupPrivilege\n\t\t\tSeDebugPrivilege')
+                ]),
+                dict(security, event_id=4634, task=12545, keywords=0x8020000000000000, weight=5, data=[
+                    ('TargetUserSid', '{user_sid}'), ('TargetUserName', '{username}'), ('TargetDomainName', '{computer}'),
+                    ('TargetLogonId', '{logon_id}'), ('LogonType', '{logon_type}')
+                ]),
+                dict(security, event_id=4625, keywords=0x8010000000000000, weight=2, data=[
+                    ('SubjectUserSid', 'S-1-0-0'), ('SubjectUserName', '-'), ('SubjectDomainName', '-'),
+                    ('SubjectLogonId', '0x0'), ('TargetUserSid', 'S-1-0-0'), ('TargetUserName', '{intruder}'),
+                    ('TargetDomainName', '{computer}'), ('Status', '0xc000006d'), ('FailureReason', '%%2313'),
+                    ('SubStatus', '0xc000006a'), ('LogonType', '3'), ('WorkstationName', '-'),
+                    ('IpAddress', '{ip}'), ('IpPort', '{port}')
+                ])
+            ],
+            'System': [
+                dict(provider='Service Control Manager', guid='{555908d1-a6d7-4695-8e1e-26931d2012f4}', event_id=7036,
+                     qualifiers=16384, level=4, keywords=0x8080000000000000, weight=8,
+                     data=[('param1', '{service}'), ('param2', '{state}')]),
+                dict(provider='Microsoft-Windows-User Profiles Service', guid='{89B1E9F0-5AFF-44A6-9B44-0A07A7CE5845}',
+                     event_id=1530, level=3, user_id='S-1-5-18', weight=1, data=[
+                         ('Detail', '{pid} user registry handles leaked from \\Registry\\User\\{user_sid}')
+                     ]),
+                dict(provider='EventLog', event_id=6013, qualifiers=32768, level=4, keywords=0x80000000000000, weight=1,
+                     data=[(None, '{uptime}'), (None, '60'), (None, '0 Coordinated Universal Time')])
+            ],
+            'Application': [
+                dict(provider='Application Error', event_id=1000, level=2, keywords=0x80000000000000, weight=2, data=[
+                    (None, '{application}'), (None, '{version}'), (None, '5e8f2a1c'), (None, 'ntdll.dll'),
+                    (None, '10.0.19041.3086'), (None, 'b1a7c3f2'), (None, 'c0000005'), (None, '{offset}')
+                ]),
+                dict(provider='Windows Error Reporting', event_id=1001, level=4, keywords=0x80000000000000, weight=2, data=[
+                    (None, '{bucket}'), (None, '1'), (None, 'APPCRASH'), (None, 'Not available'), (None, '0'),
+                    (None, '{application}')
+                ]),
+                dict(provider='Microsoft-Windows-Security-SPP', guid='{E23B33B0-C8C9-472C-A5F9-F2BDFEA0F156}',
+                     event_id=16384, qualifiers=16384, level=4, keywords=0x80000000000000, weight=4,
+                     data=[(None, '{restart_time}'), (None, 'RulesEngine')])
+            ]
+        }
+        definitions = self._definitions[channel] = [
+            EventDefinition(channel, host, **event) for event in events[channel]
+        ]
+        return definitions
+
+    def _columns(self, timestamps):
+        """Generate the per-record substitution context of a block of timestamps"""
+        count = len(timestamps)
+        fields = self.fields
+        services = fields.choices(self.SERVICES, count)
+        applications = fields.choices(self.APPLICATIONS, count)
+        logon_ids = fields.integers(0x10000, 0xFFFFFF, count)
+        logon_types = fields.choices(['2', '3', '3', '5', '7', '10', '11'], count)
+        ips = fields.ipv4('192.168.1', count)
+        ports = fields.integers(49152, 65535, count)
+        intruders = fields.choices(WindowsEventFormat.INTRUDERS, count)
+        offsets = fields.integers(0x1000, 0xFFFFF, count)
+        pids = fields.integers(100, 3000, count)
+        contexts = []
+        for index in range(count):
+            service, state = services[index]
+            application, version = applications[index]
+            contexts.append({
+                'computer': self.hostname, 'username': self.username, 'user_sid': WindowsEventFormat.USER_SID,
+                'logon_id': f"0x{logon_ids[index]:x}", 'logon_type': logon_types[index], 'ip': ips[index],
+                'port': str(ports[index]), 'intruder': intruders[index], 'service': service, 'state': state,
+                'application': application, 'version': version, 'offset': f"0x{offsets[index]:016x}",
+                'bucket': str(offsets[index] * 7919), 'pid': str(pids[index]), 'uptime': str(int(timestamps[index]) % 2592000),
+                'restart_time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamps[index] + 86400))
+            })
+        return contexts
+
+    def _file_header(self, chunks, next_record):
+        """Return the 4 KiB file header for chunks full chunks"""
+        header = bytearray(self.FILE_HEADER_SIZE)
+        struct.pack_into('<8sQQQIHHHH', header, 0, b'ElfFile\x00', 0, max(chunks - 1, 0), next_record,
+                         0x80, 1, 3, self.FILE_HEADER_SIZE, chunks)
+        struct.pack_into('<I', header, 0x7c, binascii.crc32(header[:0x78]))
+        return header
+
+    def write(self, path, channel, records):
+        """Write records events of a channel (Application, Security or System); returns (records, bytes)"""
+        end = self.end_time if self.end_time is not None else time.time()
+        start = end - self.history_days * 86400
+        interval = (end - start) / max(records, 1)
+        definitions = self._event_definitions(channel)
+        weights = [definition.weight for definition in definitions]
+        chunk = EvtxChunk()
+        chunks = 0
+        written = 0
+        with open(path, 'wb', buffering=self.BUFFER_SIZE) as f:
+            f.write(bytes(self.FILE_HEADER_SIZE))
+            while written < records and chunks < self.MAX_CHUNKS:
+                count = min(self.BLOCK_RECORDS, records - written)
+                timestamps = self.fields.timestamps(start, interval, written, count, end)
+                chosen = self.fields.choices(definitions, count, weights)
+                process_ids = self.fields.integers(1, 2500, count)
+                thread_ids = self.fields.integers(1, 5000, count)
+                for index, context in enumerate(self._columns(timestamps)):
+                    definition = chosen[index]
+                    record_id = written + 1
+                    filetime = int((timestamps[index] + FILETIME_EPOCH) * 10000000)
+                    values = [
+                        struct.pack('<Q', filetime), struct.pack('<Q', record_id),
+                        struct.pack('<I', process_ids[index] * 4), struct.pack('<I', thread_ids[index] * 4)
+                    ]
+                    values += [template.format_map(context).encode('utf-16-le') for template in definition.data]
+                    if not chunk.append(record_id, filetime, definition, values):
+                        f.write(chunk.finish())
+                        chunks += 1
+                        chunk.reset()
+                        if chunks == self.MAX_CHUNKS:
+                            break
+                        chunk.append(record_id, filetime, definition, values)
+                    written += 1
+            if chunk.first_record is not None and chunks < self.MAX_CHUNKS:
+                f.write(chunk.finish())
+                chunks += 1
+            f.seek(0)
+            f.write(self._file_header(chunks, written + 1))
+        os.utime(path, (end, end))
+        return written, self.FILE_HEADER_SIZE + chunks * EvtxChunk.SIZE
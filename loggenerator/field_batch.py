@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Field Batch module
+Generates whole columns of log fields per block, using NumPy when it is installed
+"""
+
+import random
+import time
+
+try:
+    import numpy
+except ImportError:  # Pure-Python fallback built on random.choices and array
+    numpy = None
+
+
+class FieldBatch:
+    """Produces blocks of timestamps, integers, IPs and pooled strings as columns"""
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy and numpy is not None
+        # Seeded from the random module so manifest seeds stay reproducible
+        self._rng = numpy.random.default_rng(random.getrandbits(64)) if self.use_numpy else None
+        self._hour_cache = {}
+        self._clock_tables = {}
+        self._ip_pools = {}
+
+    def timestamps(self, start, interval, first, count, end):
+        """Return the timestamps of slots first to first + count of an interval-second grid after start
+
+        Each timestamp falls at a random point of its own slot, so they
+        increase and the n-th of a history of n slots still lands before end;
+        anything past end (a byte target that outruns its estimate) is
+        clamped to end.
+        """
+        if self.use_numpy:
+            slots = numpy.arange(first, first + count) + self._rng.random(count)
+            return numpy.minimum(start + slots * interval, end).tolist()
+        rand = random.random
+        return [min(start + (slot + rand()) * interval, end) for slot in range(first, first + count)]
+
+    def integers(self, low, high, count):
+        """Return count integers in [low, high]"""
+        if self.use_numpy:
+            return self._rng.integers(low, high + 1, count).tolist()
+        return random.choices(range(low, high + 1), k=count)
+
+    def choices(self, pool, count, weights=None):
+        """Return count items drawn from pool (optionally weighted)"""
+        if self.use_numpy:
+            probabilities = None
+            if weights is not None:
+                total = float(sum(weights))
+                probabilities = [weight / total for weight in weights]
+            indexes = self._rng.choice(len(pool), count, p=probabilities)
+            return [pool[index] for index in indexes.tolist()]
+        return random.choices(pool, weights=weights, k=count)
+
+    def ipv4(self, prefix, count, low=2, high=254):
+        """Return count addresses inside a /24 such as '192.168.1'"""
+        key = (prefix, low, high)
+        pool = self._ip_pools.get(key)
+        if pool is None:
+            pool = self._ip_pools[key] = [f"{prefix}.{octet}" for octet in range(low, high + 1)]
+        return self.choices(pool, count)
+
+    def _hour_parts(self, hour, time_format, utc):
+        """Format the parts of time_format around %M and %S once per hour"""
+        key = (hour, time_format, utc)
+        parts = self._hour_cache.get(key)
+        if parts is None:
+            if len(self._hour_cache) > 4096:
+                self._hour_cache.clear()
+            moment = (time.gmtime if utc else time.localtime)(hour * 3600)
+            head, _, rest = time_format.partition('%M')
+            middle, _, tail = rest.partition('%S')
+            parts = self._hour_cache[key] = (
+                time.strftime(head, moment), time.strftime(middle, moment), time.strftime(tail, moment)
+            )
+        return parts
+
+    def _clock_table(self, separator):
+        """Return the 3600 "MM<separator>SS" strings of an hour"""
+        table = self._clock_tables.get(separator)
+        if table is None:
+            table = self._clock_tables[separator] = [
+                f"{minute:02d}{separator}{second:02d}" for minute in range(60) for second in range(60)
+            ]
+        return table
+
+    def format_times(self, timestamps, time_format, utc=False):
+        """Format a block of timestamps, calling strftime once per hour instead of once per line
+
+        Minutes and seconds are spliced in arithmetically, which holds for
+        formats with %M before %S and for whole-hour UTC offsets; anything else
+        falls back to one strftime per distinct second.
+        """
+        whole_hour_offset = utc or time.localtime().tm_gmtoff % 3600 == 0
+        position_m, position_s = time_format.find('%M'), time_format.find('%S')
+        if not whole_hour_offset or position_m < 0 or position_s < position_m:
+            convert = time.gmtime if utc else time.localtime
+            cache = {}
+            stamps = []
+            for timestamp in timestamps:
+                second = int(timestamp)
+                stamp = cache.get(second)
+                if stamp is None:
+                    stamp = cache[second] = time.strftime(time_format, convert(second))
+                stamps.append(stamp)
+            return stamps
+
+        stamps = []
+        current_hour = None
+        head = tail = ''
+        clock = None
+        for timestamp in timestamps:
+            hour, within = divmod(int(timestamp), 3600)
+            if hour != current_hour:
+                current_hour = hour
+                head, middle, tail = self._hour_parts(hour, time_format, utc)
+                clock = self._clock_table(middle)
+            stamps.append(head + clock[within] + tail)
+        return stamps
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Log Formats module
+Line formats used by the streaming log engine, one class per generated log file
+"""
+
+import string
+from loggenerator.field_batch import FieldBatch
+
+
+class LogFormat:
+    """Base class turning a block of Unix timestamps into log lines"""
+
+    # File name written below the logs directory
+    file_name = None
+
+    # strftime pattern of the line timestamp
+    time_format = '%b %d %H:%M:%S'
+
+    # Format timestamps in UTC instead of local time
+    utc = False
+
+    def __init__(self, hostname, username):
+        self.hostname = hostname
+        self.username = username
+        self.fields = FieldBatch()
+        self._positional_cache = {}
+
+    def _stamps(self, timestamps):
+        """Format the timestamps of a block in bulk"""
+        return self.fields.format_times(timestamps, self.time_format, self.utc)
+
+    def _messages(self, templates, count, **columns):
+        """Fill count templates drawn from a pool with per-line values from equally long columns"""
+        names = tuple(columns)
+        key = (id(templates), names)
+        positional = self._positional_cache.get(key)
+        if positional is None:
+            # Rewrite {name} fields as {index} once so each line is a single positional format call
+            positional = self._positional_cache[key] = [self._to_positional(template, names) for template in templates]
+        chosen = self.fields.choices(positional, count)
+        return [template.format(*values) for template, *values in zip(chosen, *columns.values())]
+
+    @staticmethod
+    def _to_positional(template, names):
+        """Rewrite the named fields of a format string as indexes into names"""
+        parts = []
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+            if name is not None:
+                parts.append('{' + str(names.index(name)) + (f"!{conversion}" if conversion else '')
+                             + (f":{spec}" if spec else '') + '}')
+        return ''.join(parts)
+
+    def header(self, timestamp):
+        """Return the lines written once at the top of a new file started at timestamp"""
+        return []
+
+    def render(self, timestamps):
+        """Abstract method returning one line (without newline) per timestamp"""
+        raise NotImplementedError("Subclasses must implement render method")
+
+
+class ApacheAccessFormat(LogFormat):
+    """Apache combined log format"""
+
+    file_name = 'apache_access.log'
+    time_format = '%d/%b/%Y:%H:%M:%S %z'
+
+    CLIENTS = ['192.168.1.15', '192.168.1.23', '192.168.1.67', '192.168.1.89', '10.0.0.12', '10.0.0.45',
+               '172.16.4.21', '203.0.113.54', '198.51.100.7', '66.249.66.1']
+    REQUESTS = [('GET', '/', 200), ('GET', '/index.html', 200), ('GET', '/api/users', 200),
+                ('POST', '/login', 200), ('GET', '/dashboard', 200), ('GET', '/static/style.css', 200),
+                ('GET', '/static/app.js', 200), ('GET', '/favicon.ico', 404), ('GET', '/api/data', 404),
+                ('GET', '/admin', 403), ('POST', '/api/orders', 201), ('GET', '/api/orders', 304),
+                ('GET', '/wp-login.php', 404), ('GET', '/api/reports/export', 500)]
+    REFERERS = ['-', 'http://example.com/', 'http://example.com/login', 'http://example.com/dashboard',
+                'https://www.google.com/']
+    USER_AGENTS = ['Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+                   'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:98.0) Gecko/20100101 Firefox/98.0',
+                   'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+                   'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+                   'curl/7.68.0']
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        return [
+            f'{client} - - [{stamp}] "{method} {path} HTTP/1.1" '
+            f'{status} {size if status < 300 else small} "{referer}" "{agent}"'
+            for stamp, client, (method, path, status), size, small, referer, agent in zip(
+                self._stamps(timestamps), fields.choices(self.CLIENTS, count), fields.choices(self.REQUESTS, count),
+                fields.integers(200, 6000, count), fields.integers(0, 400, count),
+                fields.choices(self.REFERERS, count), fields.choices(self.USER_AGENTS, count)
+            )
+        ]
+
+
+class SyslogFormat(LogFormat):
+    """Traditional syslog file written by rsyslog"""
+
+    file_name = 'syslog'
+
+    MESSAGES = [
+        'systemd[1]: Starting Network Manager...',
+        'systemd[1]: Started Network Manager.',
+        'NetworkManager[{pid}]: <info>  [{epoch}.{micro}] device (eth0): carrier is ON',
+        'systemd[1]: nginx.service: Succeeded.',
+        'systemd[1]: Started Session {session} of user {username}.',
+        'cron[{pid}]: (root) CMD (test -x /usr/sbin/anacron || ( cd / && run-parts --report /etc/cron.daily ))',
+        'CRON[{pid}]: (root) CMD (command -v debian-sa1 > /dev/null && debian-sa1 1 1)',
+        'systemd-resolved[{pid}]: Using degraded feature set UDP instead of UDP+EDNS0 for DNS server 192.168.1.1.',
+        'dhclient[{pid}]: DHCPACK of 192.168.1.{octet} from 192.168.1.1',
+        'snapd[{pid}]: storehelpers.go:769: cannot refresh: snap has no updates available',
+        'systemd[1]: Starting Daily apt download activities...',
+        'systemd[1]: apt-daily.service: Deactivated successfully.'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        prefix = f" {self.hostname} "
+        messages = self._messages(
+            self.MESSAGES, count, pid=fields.integers(300, 32000, count), epoch=[int(t) for t in timestamps],
+            micro=fields.integers(1000, 9999, count), session=fields.integers(1, 400, count),
+            username=[self.username] * count, octet=fields.integers(2, 254, count)
+        )
+        return [stamp + prefix + message for stamp, message in zip(self._stamps(timestamps), messages)]
+
+
+class AuthLogFormat(LogFormat):
+    """Authentication log with sshd, sudo and logind activity"""
+
+    file_name = 'auth.log'
+
+    MESSAGES = [
+        'sshd[{pid}]: Accepted publickey for {username} from {ip} port {port} ssh2: RSA SHA256:{fingerprint}',
+        'sshd[{pid}]: Failed password for invalid user {intruder} from {ip} port {port} ssh2',
+        'sshd[{pid}]: Connection closed by authenticating user {username} {ip} port {port} [preauth]',
+        'sudo: {username} : TTY=pts/0 ; PWD=/home/{username} ; USER=root ; COMMAND=/bin/systemctl status nginx',
+        'sudo: pam_unix(sudo:session): session opened for user root by {username}(uid=1000)',
+        'sudo: pam_unix(sudo:session): session closed for user root',
+        'systemd-logind[{pid}]: New session {session} of user {username}.',
+        'systemd-logind[{pid}]: Session {session} logged out. Waiting for processes to exit.',
+        'CRON[{pid}]: pam_unix(cron:session): session opened for user root(uid=0) by (uid=0)'
+    ]
+    INTRUDERS = ['admin', 'test', 'oracle', 'ubuntu', 'postgres', 'git', 'guest']
+    # /24 the SSH clients connect from; shared with the binary login records
+    CLIENT_PREFIX = '192.168.1'
+    FINGERPRINT_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        prefix = f" {self.hostname} "
+        fingerprint = ''.join(fields.choices(self.FINGERPRINT_CHARS, 43))
+        messages = self._messages(
+            self.MESSAGES, count, pid=fields.integers(300, 32000, count), username=[self.username] * count,
+            session=fields.integers(1, 400, count), ip=fields.ipv4(self.CLIENT_PREFIX, count),
+            port=fields.integers(32768, 60999, count), intruder=fields.choices(self.INTRUDERS, count),
+            fingerprint=[fingerprint] * count
+        )
+        return [stamp + prefix + message for stamp, message in zip(self._stamps(timestamps), messages)]
+
+
+class NginxErrorFormat(LogFormat):
+    """Nginx error log"""
+
+    file_name = 'nginx_error.log'
+    time_format = '%Y/%m/%d %H:%M:%S'
+
+    MESSAGES = [
+        '[error] {pid}#{pid}: *{conn} open() "/var/www/html/favicon.ico" failed (2: No such file or directory), '
+        'client: {ip}, server: localhost, request: "GET /favicon.ico HTTP/1.1", host: "example.com"',
+        '[warn] {pid}#{pid}: *{conn} upstream server temporarily disabled while reading response header from upstream, '
+        'client: {ip}, server: localhost, request: "GET /api/slow HTTP/1.1", upstream: "http://127.0.0.1:8080/api/slow", host: "example.com"',
+        '[error] {pid}#{pid}: *{conn} connect() failed (111: Connection refused) while connecting to upstream, '
+        'client: {ip}, server: localhost, request: "POST /api/orders HTTP/1.1", upstream: "http://127.0.0.1:8080/api/orders", host: "example.com"',
+        '[notice] {pid}#{pid}: signal process started',
+        '[crit] {pid}#{pid}: *{conn} SSL_do_handshake() failed (SSL: error:0A00006C:SSL routines::bad key share) '
+        'while SSL handshaking, client: {ip}, server: 0.0.0.0:443'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        pid = fields.integers(800, 4000, 1)[0]
+        messages = self._messages(
+            self.MESSAGES, count, pid=[pid] * count, conn=fields.integers(1, 999999, count),
+            ip=fields.ipv4('192.168.1', count)
+        )
+        return [f"{stamp} {message}" for stamp, message in zip(self._stamps(timestamps), messages)]
+
+
+class ApplicationLogFormat(LogFormat):
+    """Structured application log with millisecond ISO timestamps"""
+
+    file_name = 'application.log'
+    time_format = '%Y-%m-%dT%H:%M:%S'
+    utc = True
+
+    MESSAGES = [
+        '[INFO] Application started successfully',
+        '[DEBUG] Database connection established to localhost:5432',
+        '[INFO] User authentication service initialized',
+        '[WARN] High memory usage detected: {percent}%',
+        '[INFO] Processing batch job: data_export_{job}',
+        '[ERROR] Failed to connect to external API: timeout after 30s',
+        '[INFO] Retrying external API connection (attempt {attempt}/3)',
+        '[INFO] External API connection restored',
+        '[INFO] Request completed in {millis}ms',
+        '[DEBUG] Cache hit ratio: {percent}%'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        messages = self._messages(
+            self.MESSAGES, count, percent=fields.integers(40, 95, count), job=fields.integers(10000, 99999, count),
+            attempt=fields.integers(2, 3, count), millis=fields.integers(3, 1500, count)
+        )
+        return [
+            f"{stamp}.{int(timestamp * 1000) % 1000:03d}Z {message}"
+            for stamp, timestamp, message in zip(self._stamps(timestamps), timestamps, messages)
+        ]
+
+
+class KernelLogFormat(LogFormat):
+    """Kernel ring buffer messages as written to kern.log"""
+
+    file_name = 'kernel.log'
+
+    MESSAGES = [
+        'usb 1-1: new high-speed USB device number {device} using xhci_hcd',
+        'usb 1-1: New USB device found, idVendor=0781, idProduct=5567, bcdDevice= 1.00',
+        'usb 1-1: USB disconnect, device number {device}',
+        'e1000e: eth0 NIC Link is Up 1000 Mbps Full Duplex, Flow Control: None',
+        'audit: type=1400 audit({epoch}.{millis}:{serial}): apparmor="STATUS" operation="profile_replace" name="snap-update-ns.firefox"',
+        'EXT4-fs (sda1): re-mounted. Opts: errors=remount-ro. Quota mode: none.',
+        '[UFW BLOCK] IN=eth0 OUT= MAC= SRC=203.0.113.{octet} DST=192.168.1.10 PROTO=TCP SPT={port} DPT=22',
+        'perf: interrupt took too long (2510 > 2500), lowering kernel.perf_event_max_sample_rate to 79500'
+    ]
+
+    def __init__(self, hostname, username):
+        super().__init__(hostname, username)
+        self.boot_time = None
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        prefix = f" {self.hostname} kernel: "
+        if self.boot_time is None and timestamps:
+            self.boot_time = timestamps[0] - fields.integers(60, 3600, 1)[0]
+        messages = self._messages(
+            self.MESSAGES, count, device=fields.integers(2, 12, count), epoch=[int(t) for t in timestamps],
+            millis=fields.integers(100, 999, count), serial=fields.integers(100, 9999, count),
+            octet=fields.integers(1, 254, count), port=fields.integers(1024, 65535, count)
+        )
+        boot_time = self.boot_time
+        return [
+            f"{stamp}{prefix}[{timestamp - boot_time:12.6f}] {message}"
+            for stamp, timestamp, message in zip(self._stamps(timestamps), timestamps, messages)
+        ]
+
+
+# Streaming formats for the Linux log files, in the order they are generated
+LINUX_LOG_FORMATS = [
+    ApacheAccessFormat,
+    SyslogFormat,
+    AuthLogFormat,
+    NginxErrorFormat,
+    ApplicationLogFormat,
+    KernelLogFormat
+]
+
+
+class IISAccessFormat(LogFormat):
+    """IIS W3C extended log format"""
+
+    file_name = 'iis_access.log'
+    time_format = '%Y-%m-%d %H:%M:%S'
+    utc = True
+
+    REQUESTS = [('GET', '/default.htm', 200), ('GET', '/api/users', 200), ('POST', '/login', 200),
+                ('GET', '/dashboard', 200), ('GET', '/api/data', 404), ('GET', '/Content/site.css', 200),
+                ('GET', '/Scripts/app.js', 304), ('POST', '/api/orders', 201), ('GET', '/admin', 401),
+                ('GET', '/api/reports/export', 500)]
+    USER_AGENTS = ['Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64)+AppleWebKit/537.36',
+                   'Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64;+rv:124.0)+Gecko/20100101+Firefox/124.0',
+                   'curl/7.68.0', 'Microsoft-WNS/10.0']
+    REFERERS = ['-', 'http://example.com/', 'http://example.com/login']
+
+    def header(self, timestamp):
+        return [
+            '#Software: Microsoft Internet Information Services 10.0',
+            '#Version: 1.0',
+            f"#Date: {self._stamps([timestamp])[0]}",
+            '#Fields: date time s-sitename s-computername s-ip cs-method cs-uri-stem cs-uri-query s-port '
+            'cs-username c-ip cs-version cs(User-Agent) cs(Cookie) cs(Referer) cs-host sc-status sc-substatus '
+            'sc-win32-status sc-bytes cs-bytes time-taken'
+        ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        users = fields.choices(['-', '-', self.username], count)
+        return [
+            f"{stamp} W3SVC1 {self.hostname} 192.168.1.10 {method} {path} - 80 {user} {client} HTTP/1.1 "
+            f"{agent} - {referer} example.com {status} 0 {0 if status < 400 else 2} {size} {request_size} {taken}"
+            for stamp, (method, path, status), user, client, agent, referer, size, request_size, taken in zip(
+                self._stamps(timestamps), fields.choices(self.REQUESTS, count), users,
+                fields.ipv4('192.168.1', count, 100, 199), fields.choices(self.USER_AGENTS, count),
+                fields.choices(self.REFERERS, count), fields.integers(200, 6000, count),
+                fields.integers(120, 600, count), fields.integers(5, 400, count)
+            )
+        ]
+
+
+class WindowsEventFormat(LogFormat):
+    """Event Viewer entries exported as text"""
+
+    file_name = 'windows_events.log'
+    time_format = '%m/%d/%Y %H:%M:%S'
+
+    EVENTS = [
+        'Information Application 1000 N/A {computer} Application started successfully. Process ID: {pid}',
+        'Warning Application 1001 N/A {computer} High memory usage detected: {percent}% of available memory in use',
+        'Information Security 4624 N/A {computer} An account was successfully logged on. Subject: Security ID: '
+        '{user_sid}, Account Name: {username}, Account Domain: {computer}',
+        'Information Security 4634 N/A {computer} An account was logged off. Subject: Security ID: '
+        '{user_sid}, Account Name: {username}',
+        'Audit_Failure Security 4625 N/A {computer} An account failed to log on. Account Name: {intruder}, '
+        'Source Network Address: 192.168.1.{octet}',
+        'Information System 7036 Service_Control_Manager {computer} The Windows Update service entered the running state.',
+        'Error Application 1002 N/A {computer} Failed to connect to external service: Connection timeout after 30 seconds',
+        'Warning System 1530 User_Profile_Service {computer} Windows detected your registry file is still in use by '
+        'other applications or services. The file will be unloaded now.'
+    ]
+    INTRUDERS = ['Administrator', 'admin', 'guest', 'backup', 'sqlsvc']
+    # Security ID of the local user; shared with the EVTX records
+    USER_SID = 'S-1-5-21-123456789-987654321-111111111-1001'
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        messages = self._messages(
+            self.EVENTS, count, computer=[self.hostname] * count, username=[self.username] * count,
+            user_sid=[self.USER_SID] * count,
+            pid=fields.integers(400, 12000, count), percent=fields.integers(70, 97, count),
+            intruder=fields.choices(self.INTRUDERS, count), octet=fields.integers(2, 254, count)
+        )
+        return [f"{stamp} {message}" for stamp, message in zip(self._stamps(timestamps), messages)]
+
+
+class PowerShellLogFormat(LogFormat):
+    """PowerShell transcript-style execution log"""
+
+    file_name = 'powershell_execution.log'
+    time_format = '%Y-%m-%dT%H:%M:%S'
+    utc = True
+
+    MESSAGES = [
+        '[INFO] PowerShell execution started by user: {username}',
+        "[DEBUG] Module 'ActiveDirectory' loaded successfully",
+        '[INFO] Executing command: Get-ADUser -Filter *',
+        '[WARN] Command execution took longer than expected: {seconds}.{tenths} seconds',
+        '[INFO] Returned {objects} user objects',
+        '[DEBUG] Memory usage: {megabytes}.{tenths} MB',
+        '[INFO] Script execution completed successfully',
+        '[INFO] Executing command: Get-Service | Where-Object Status -eq Running'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        messages = self._messages(
+            self.MESSAGES, count, username=[self.username] * count, seconds=fields.integers(5, 40, count),
+            tenths=fields.integers(0, 9, count), objects=fields.integers(20, 900, count),
+            megabytes=fields.integers(60, 400, count)
+        )
+        return [
+            f"{stamp}.{int(timestamp * 1000) % 1000:03d}Z {message}"
+            for stamp, timestamp, message in zip(self._stamps(timestamps), timestamps, messages)
+        ]
+
+
+class SqlServerErrorFormat(LogFormat):
+    """SQL Server ERRORLOG"""
+
+    file_name = 'sqlserver_error.log'
+    time_format = '%Y-%m-%d %H:%M:%S'
+
+    MESSAGES = [
+        "spid{spid}      Logon       Login succeeded for user '{username}'. Connection made using Windows authentication.",
+        "spid{spid}      Logon       Login failed for user 'sa'. Reason: Password did not match that for the login provided. [CLIENT: 192.168.1.{octet}]",
+        'spid{spid}      Backup      Database backed up. Database: SalesDB, pages dumped: {pages}, first LSN: 37:{lsn}:1, last LSN: 37:{lsn}:3',
+        'spid{spid}s     Server      SQL Server is now ready for client connections. This is an informational message; no user action is required.',
+        'spid{spid}      Server      Using dynamic lock allocation. Initial allocation of 2500 Lock blocks and 5000 Lock Owner blocks per node.',
+        'spid{spid}      Database    Setting database option RECOVERY to FULL for database [SalesDB].'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        messages = self._messages(
+            self.MESSAGES, count, spid=fields.integers(51, 120, count), username=[self.username] * count,
+            octet=fields.integers(2, 254, count), pages=fields.integers(100, 90000, count),
+            lsn=fields.integers(100, 999, count)
+        )
+        return [
+            f"{stamp}.{int(timestamp * 100) % 100:02d} {message}"
+            for stamp, timestamp, message in zip(self._stamps(timestamps), timestamps, messages)
+        ]
+
+
+class WindowsApplicationLogFormat(LogFormat):
+    """Service-oriented application log of the Windows host"""
+
+    file_name = 'application.log'
+    time_format = '%Y-%m-%dT%H:%M:%S'
+    utc = True
+
+    MESSAGES = [
+        '[INFO] CustomerService - Processing customer order #{order}',
+        '[DEBUG] CustomerService - Validating customer ID: CUST{customer:03d}',
+        '[INFO] InventoryService - Checking product availability for SKU: PROD{sku}',
+        '[WARN] InventoryService - Low stock warning: Only {stock} units remaining for PROD{sku}',
+        '[INFO] PaymentService - Payment authorized successfully - Transaction ID: TXN{transaction}',
+        '[INFO] OrderService - Order #{order} completed successfully',
+        '[ERROR] NotificationService - Failed to send order confirmation email: SMTP server unreachable',
+        '[INFO] NotificationService - Email notification sent successfully'
+    ]
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        messages = self._messages(
+            self.MESSAGES, count, order=fields.integers(10000, 99999, count), customer=fields.integers(1, 999, count),
+            sku=fields.integers(100, 999, count), stock=fields.integers(1, 9, count),
+            transaction=fields.integers(100000000, 999999999, count)
+        )
+        return [
+            f"{stamp}.{int(timestamp * 1000) % 1000:03d}Z {message}"
+            for stamp, timestamp, message in zip(self._stamps(timestamps), timestamps, messages)
+        ]
+
+
+class PerformanceCsvFormat(LogFormat):
+    """Performance counter samples as CSV"""
+
+    file_name = 'performance.csv'
+    time_format = '%m/%d/%Y %H:%M:%S'
+
+    def header(self, timestamp):
+        return ['Timestamp,CPU Usage (%),Memory Usage (MB),Disk Usage (%),Network In (KB/s),Network Out (KB/s)']
+
+    def render(self, timestamps):
+        count = len(timestamps)
+        fields = self.fields
+        return [
+            f"{stamp},{cpu / 10:.1f},{memory},{disk / 10:.1f},{net_in / 10:.1f},{net_out / 10:.1f}"
+            for stamp, cpu, memory, disk, net_in, net_out in zip(
+                self._stamps(timestamps), fields.integers(20, 950, count), fields.integers(1800, 7800, count),
+                fields.integers(550, 800, count), fields.integers(50, 4000, count), fields.integers(50, 2500, count)
+            )
+        ]
+
+
+# Streaming formats for the Windows log files, in the order they are generated
+WINDOWS_LOG_FORMATS = [
+    IISAccessFormat,
+    WindowsEventFormat,
+    PowerShellLogFormat,
+    SqlServerErrorFormat,
+    WindowsApplicationLogFormat,
+    PerformanceCsvFormat
+]
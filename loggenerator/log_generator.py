@@ -4,32 +4,115 @@ Base Log Generator module
 Contains the abstract base class for log file generation
 """
 
-from pathlib import Path
-import datetime
+import getpass
+import os
+import random
+import socket
+import time
+from os_detector import OSDetector
+from loggenerator.log_stream import stream_segment
 
 
 class LogGenerator:
     """Base class for log file generation"""
     
     def __init__(self):
+        self.profile = OSDetector.get_profile()
         self.logs_dir = self._get_logs_directory()
+        # Volume of every streamed log, split across the live file and its rotated
+        # generations; target_bytes takes precedence when set
+        self.target_lines = 5000
+        self.target_bytes = None
+        # Days of history the streamed timestamps are spread over
+        self.history_days = 90
+        # Rotated generations kept next to each log (syslog.1, syslog.2.gz, ...);
+        # generations from compress_from on are gzip-compressed like logrotate's delaycompress
+        self.rotations = 4
+        self.compress_from = 2
+        # Worker processes streaming and compressing the files; None uses every core
+        self.max_workers = None
     
     def _get_logs_directory(self):
         """Get the default logs directory path for the current OS"""
-        home = Path.home()
+        home = self.profile.home
         return home / 'Generated_Logs'
     
-    def _get_current_timestamp(self):
-        """Get current timestamp in various formats"""
-        now = datetime.datetime.now()
-        return {
-            'iso': now.isoformat(),
-            'syslog': now.strftime('%b %d %H:%M:%S'),
-            'apache': now.strftime('%d/%b/%Y:%H:%M:%S %z'),
-            'nginx': now.strftime('%d/%b/%Y:%H:%M:%S %z'),
-            'windows': now.strftime('%m/%d/%Y %I:%M:%S %p'),
-            'epoch': int(now.timestamp())
-        }
+    def _get_log_formats(self):
+        """Return the LogFormat classes streamed by this generator"""
+        return []
+    
+    def _build_log_formats(self):
+        """Instantiate the log formats for this host and user"""
+        hostname = socket.gethostname()
+        username = getpass.getuser()
+        return [format_class(hostname, username) for format_class in self._get_log_formats()]
+    
+    def _rotation_name(self, file_name, generation):
+        """Return the file name of a rotated generation (0 is the live file)"""
+        if generation == 0:
+            return file_name
+        suffix = '.gz' if generation >= self.compress_from else ''
+        return f"{file_name}.{generation}{suffix}"
+    
+    def _stream_jobs(self, include_live=True):
+        """Build one stream_segment job per log file and rotated generation
+        
+        The history is split into rotations + 1 equal periods, newest first,
+        and the target volume of a log is split evenly across its generations
+        (the live file takes the remainder).
+        """
+        hostname = socket.gethostname()
+        username = getpass.getuser()
+        period_days = self.history_days / (self.rotations + 1)
+        now = time.time()
+        generations = self.rotations + 1
+        total = self.target_bytes or self.target_lines
+        jobs = []
+        for format_class in self._get_log_formats():
+            for generation in range(0 if include_live else 1, self.rotations + 1):
+                path = self.logs_dir / self._rotation_name(format_class.file_name, generation)
+                end_time = now - generation * period_days * 86400
+                share = max(1, total // generations + (total % generations if generation == 0 else 0))
+                jobs.append((format_class, hostname, username, path, period_days, end_time,
+                             share if self.target_bytes else None, None if self.target_bytes else share,
+                             random.getrandbits(64)))
+        return jobs
+    
+    def _remove_stale_rotations(self):
+        """Delete generations left over from an earlier run with more rotations"""
+        for format_class in self._get_log_formats():
+            for path in self.logs_dir.glob(f"{format_class.file_name}.*"):
+                generation = path.name[len(format_class.file_name) + 1:].split('.')[0]
+                if generation.isdigit() and int(generation) > self.rotations:
+                    path.unlink()
+    
+    def _stream_logs(self, include_live=True):
+        """Stream every log and its rotated archives in a process pool; returns (path, lines, bytes) per file"""
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_rotations()
+        jobs = self._stream_jobs(include_live)
+        workers = min(len(jobs), self.max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return [stream_segment(job) for job in jobs]
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Never fork: the caller may already run worker threads
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as executor:
+            return list(executor.map(stream_segment, jobs))
+    
+    def tail_logs(self, lines_per_minute=6, duration=None, fsync_interval=10.0):
+        """Keep appending live lines to every log until interrupted (or for duration seconds)"""
+        from loggenerator.log_tailer import LogTailer
+        tailer = LogTailer(self.logs_dir, self._build_log_formats(), lines_per_minute, fsync_interval, duration)
+        print(f"Tailing {len(tailer.log_formats)} logs in {self.logs_dir} "
+              f"({lines_per_minute} lines/minute per file, Ctrl+C to stop)...")
+        written = tailer.run()
+        return type('Result', (), {
+            'returncode': 0,
+            'stdout': "Lines appended:\n" + "".join(f"- {name}: {count}\n" for name, count in written.items()),
+            'stderr': ''
+        })()
     
     def generate_logs(self):
         """Abstract method to be implemented by subclasses"""
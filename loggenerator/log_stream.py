@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Log Stream module
+Streams log files of any size with monotonically advancing timestamps in constant memory
+"""
+
+import gzip
+import os
+import random
+import time
+from pathlib import Path
+from loggenerator.field_batch import FieldBatch
+
+
+class LogStreamEngine:
+    """Writes LogFormat lines block by block until a target size or line count is reached"""
+
+    # Lines rendered and written per block
+    BLOCK_LINES = 4096
+
+    # Size of the userspace write buffer of every output file
+    BUFFER_SIZE = 1024 * 1024
+
+    # Lines rendered to estimate the average line length when streaming to a byte target
+    SAMPLE_LINES = 512
+
+    # gzip level of compressed (.gz) outputs; 6 matches gzip's and logrotate's default
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, history_days=90, end_time=None):
+        self.history_days = history_days
+        self.end_time = end_time
+        self.fields = FieldBatch()
+
+    def _estimate_line_bytes(self, log_format, start):
+        """Measure the average encoded line length of a format"""
+        # A scratch instance keeps the sample from touching the real format's state
+        scratch = type(log_format)(log_format.hostname, log_format.username)
+        sample = scratch.render([start + offset for offset in range(self.SAMPLE_LINES)])
+        return max(1.0, sum(len(line.encode('utf-8')) + 1 for line in sample) / len(sample))
+
+    def _timestamps(self, start, interval, end):
+        """Yield blocks of increasing timestamps spaced interval seconds on average, never past end"""
+        first = 0
+        while True:
+            yield self.fields.timestamps(start, interval, first, self.BLOCK_LINES, end)
+            first += self.BLOCK_LINES
+
+    def stream(self, path, log_format, target_bytes=None, target_lines=None):
+        """Write one log file and return (lines written, bytes written)
+
+        The history covers history_days up to end_time (default now). With a
+        byte target the line spacing is derived from a measured sample so the
+        file still spans the whole history; the last block is cut at a line
+        boundary so the file never exceeds target_bytes. Paths ending in .gz
+        are compressed on the fly; their targets count uncompressed bytes.
+        """
+        if target_bytes is None and target_lines is None:
+            raise ValueError("stream() needs target_bytes or target_lines")
+
+        end = self.end_time if self.end_time is not None else time.time()
+        start = end - self.history_days * 86400
+        expected_lines = target_lines
+        if expected_lines is None:
+            expected_lines = max(1, int(target_bytes / self._estimate_line_bytes(log_format, start)))
+        interval = (end - start) / expected_lines
+
+        lines_written = 0
+        bytes_written = 0
+        if Path(path).suffix == '.gz':
+            output = gzip.open(path, 'wb', compresslevel=self.COMPRESS_LEVEL)
+        else:
+            output = open(path, 'wb', buffering=self.BUFFER_SIZE)
+        with output as f:
+            header = log_format.header(start)
+            if header:
+                data = ('\n'.join(header) + '\n').encode('utf-8')
+                f.write(data)
+                bytes_written += len(data)
+
+            for timestamps in self._timestamps(start, interval, end):
+                if target_lines is not None:
+                    remaining = target_lines - lines_written
+                    if remaining <= 0:
+                        break
+                    timestamps = timestamps[:remaining]
+
+                lines = log_format.render(timestamps)
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                if target_bytes is not None and bytes_written + len(data) >= target_bytes:
+                    cut = data.rfind(b'\n', 0, target_bytes - bytes_written) + 1
+                    f.write(data[:cut])
+                    lines_written += data.count(b'\n', 0, cut)
+                    bytes_written += cut
+                    break
+
+                f.write(data)
+                lines_written += len(lines)
+                bytes_written += len(data)
+
+        os.utime(path, (end, end))
+        return lines_written, bytes_written
+
+    def stream_all(self, logs_dir, log_formats, target_bytes=None, target_lines=None):
+        """Stream every format into logs_dir and return (path, lines, bytes) per file"""
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        results = []
+        for log_format in log_formats:
+            path = logs_dir / log_format.file_name
+            lines, size = self.stream(path, log_format, target_bytes, target_lines)
+            results.append((path, lines, size))
+        return results
+
+
+def stream_segment(job):
+    """Stream one log file (or rotated archive) in a worker process
+
+    job is (format class, hostname, username, path, history_days, end_time,
+    target_bytes, target_lines, seed) and the result is (path, lines, bytes).
+    """
+    format_class, hostname, username, path, history_days, end_time, target_bytes, target_lines, seed = job
+    random.seed(seed)
+    engine = LogStreamEngine(history_days, end_time)
+    lines, size = engine.stream(path, format_class(hostname, username), target_bytes, target_lines)
+    return Path(path), lines, size
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Log Tailer module
+Keeps appending live entries to the generated logs from a single asyncio event loop
+"""
+
+import asyncio
+import os
+import random
+import signal
+import time
+
+
+class LogTailer:
+    """Appends new lines to every log file at a configurable rate with batched fsync"""
+
+    # Size of the userspace write buffer of every tailed file
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, logs_dir, log_formats, lines_per_minute=6, fsync_interval=10.0, duration=None):
+        # The pauses are drawn from expovariate(rate), which needs a positive rate
+        if not lines_per_minute > 0:
+            raise ValueError(f"lines_per_minute must be positive, got {lines_per_minute}")
+        self.logs_dir = logs_dir
+        self.log_formats = log_formats
+        self.lines_per_minute = lines_per_minute
+        self.fsync_interval = fsync_interval
+        self.duration = duration
+        self.lines_written = {log_format.file_name: 0 for log_format in log_formats}
+        self._handles = {}
+        self._dirty = set()
+
+    def _open(self, log_format):
+        """Open a log for appending, writing the format header if the file is new"""
+        path = self.logs_dir / log_format.file_name
+        is_new = not path.exists() or path.stat().st_size == 0
+        handle = open(path, 'ab', buffering=self.BUFFER_SIZE)
+        if is_new:
+            header = log_format.header(time.time())
+            if header:
+                handle.write(('\n'.join(header) + '\n').encode('utf-8'))
+        self._handles[log_format.file_name] = handle
+        return handle
+
+    async def _append_forever(self, log_format):
+        """Append lines separated by exponentially distributed pauses (a Poisson process)"""
+        handle = self._handles[log_format.file_name]
+        rate = self.lines_per_minute / 60.0
+        while True:
+            await asyncio.sleep(random.expovariate(rate))
+            line = log_format.render([time.time()])[0]
+            handle.write((line + '\n').encode('utf-8'))
+            self.lines_written[log_format.file_name] += 1
+            self._dirty.add(log_format.file_name)
+
+    def _sync_dirty(self):
+        """Flush and fsync every file written since the last sync"""
+        for file_name in self._dirty:
+            handle = self._handles[file_name]
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._dirty.clear()
+
+    async def _sync_forever(self):
+        """Batch the durability cost of all files into one fsync pass per interval"""
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            self._sync_dirty()
+
+    async def _main(self):
+        """Run one appender task per file plus the sync task until stopped"""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (getattr(signal, 'SIGINT', None), getattr(signal, 'SIGTERM', None)):
+            if sig is None:
+                continue
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows event loops do not support signal handlers
+
+        tasks = [asyncio.create_task(self._append_forever(log_format)) for log_format in self.log_formats]
+        tasks.append(asyncio.create_task(self._sync_forever()))
+        try:
+            await asyncio.wait_for(stop.wait(), self.duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self):
+        """Tail every log until interrupted or duration seconds have passed; returns lines written per file"""
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            for log_format in self.log_formats:
+                self._open(log_format)
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._sync_dirty()
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+        return dict(self.lines_written)
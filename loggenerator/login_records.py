@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Login Records module
+Writes binary utmp-format wtmp/btmp, lastlog and journal export streams consistent with auth.log
+"""
+
+import re
+import socket
+import struct
+import time
+import uuid
+from loggenerator.field_batch import FieldBatch
+from loggenerator.log_formats import AuthLogFormat, SyslogFormat
+
+
+class LoginRecordWriter:
+    """Packs login records with struct into preallocated buffers and writes them in bulk"""
+
+    # struct utmp of glibc on Linux (x86_64 and most 64-bit ABIs): 384 bytes
+    UTMP = struct.Struct('<hxxi32s4s32s256shhiii16s20x')
+
+    # struct lastlog: 292 bytes per uid, indexed by uid
+    LASTLOG = struct.Struct('<i32s256s')
+
+    # ut_type values
+    RUN_LVL = 1
+    BOOT_TIME = 2
+    LOGIN_PROCESS = 6
+    USER_PROCESS = 7
+    DEAD_PROCESS = 8
+
+    # Records packed per buffer before a write
+    BLOCK_RECORDS = 8192
+
+    # Average number of interactive sessions between two reboots
+    SESSIONS_PER_BOOT = 40
+
+    KERNEL_RELEASE = '5.15.0-72-generic'
+
+    JOURNAL_LINE = re.compile(r'^([\w.-]+)(?:\[(\d+)\])?: (.*)$')
+
+    def __init__(self, hostname, username, history_days=90, end_time=None):
+        self.hostname = hostname
+        self.username = username
+        self.history_days = history_days
+        self.end_time = end_time
+        self.fields = FieldBatch()
+        self._addresses = {}
+
+    def _time_range(self):
+        """Return (start, end) of the generated history"""
+        end = self.end_time if self.end_time is not None else time.time()
+        return end - self.history_days * 86400, end
+
+    def _address(self, ip):
+        """Return ut_addr_v6 for an IPv4 address (network order in the first word)"""
+        address = self._addresses.get(ip)
+        if address is None:
+            address = self._addresses[ip] = socket.inet_aton(ip) + bytes(12)
+        return address
+
+    def _write_blocks(self, path, pack_block, total):
+        """Write total records packed block by block into one reused buffer"""
+        size = self.UTMP.size
+        buffer = bytearray(size * self.BLOCK_RECORDS)
+        view = memoryview(buffer)
+        written = 0
+        with open(path, 'wb', buffering=0) as f:
+            while written < total:
+                count = min(self.BLOCK_RECORDS, total - written)
+                pack_block(buffer, count)
+                f.write(view[:count * size])
+                written += count
+        return written, written * size
+
+    def write_wtmp(self, path, sessions):
+        """Write sessions login/logout pairs, some replaced by reboots; returns (records, bytes)
+
+        Every logout happens before the next login, so records are appended
+        in chronological order like a real wtmp.
+        """
+        start, end = self._time_range()
+        interval = (end - start) / max(sessions, 1)
+        pack_into = self.UTMP.pack_into
+        size = self.UTMP.size
+        user = self.username.encode('utf-8')
+        kernel = self.KERNEL_RELEASE.encode('ascii')
+        state = {'next_login': self.fields.timestamps(start, interval, 0, 1, end)[0], 'slot': 1, 'session': 1}
+
+        def pack_block(buffer, count):
+            fields = self.fields
+            pairs = count // 2
+            pending = state['next_login']
+            logins = [pending] + fields.timestamps(start, interval, state['slot'], pairs, end)
+            state['next_login'] = logins[pairs]
+            state['slot'] += pairs
+            durations = fields.integers(5, 95, pairs)
+            ips = fields.ipv4(AuthLogFormat.CLIENT_PREFIX, pairs)
+            pids = fields.integers(1000, 60000, pairs)
+            terminals = fields.integers(0, 9, pairs)
+            reboots = fields.integers(1, self.SESSIONS_PER_BOOT, pairs)
+            offset = 0
+            for index in range(pairs):
+                login_time = logins[index]
+                gap = logins[index + 1] - login_time
+                if reboots[index] == 1:
+                    # A reboot leaves BOOT_TIME and RUN_LVL records instead of a session
+                    pack_into(buffer, offset, self.BOOT_TIME, 0, b'~', b'~~', b'reboot', kernel,
+                              0, 0, 0, int(login_time), 0, bytes(16))
+                    pack_into(buffer, offset + size, self.RUN_LVL, 53, b'~', b'~~', b'runlevel', kernel,
+                              0, 0, 0, int(login_time + min(20, gap / 2)), 0, bytes(16))
+                else:
+                    logout_time = login_time + gap * durations[index] / 100
+                    line = f"pts/{terminals[index]}".encode('ascii')
+                    tty_id = f"ts/{terminals[index]}".encode('ascii')
+                    pack_into(buffer, offset, self.USER_PROCESS, pids[index], line, tty_id, user,
+                              ips[index].encode('ascii'), 0, 0, state['session'], int(login_time),
+                              int(login_time % 1 * 1000000), self._address(ips[index]))
+                    pack_into(buffer, offset + size, self.DEAD_PROCESS, pids[index], line, tty_id, b'', b'',
+                              0, 0, 0, int(logout_time), int(logout_time % 1 * 1000000), bytes(16))
+                    state['session'] += 1
+                offset += 2 * size
+
+        return self._write_blocks(path, pack_block, sessions * 2)
+
+    def write_btmp(self, path, attempts):
+        """Write failed SSH login attempts by the intruder accounts seen in auth.log; returns (records, bytes)"""
+        start, end = self._time_range()
+        interval = (end - start) / max(attempts, 1)
+        pack_into = self.UTMP.pack_into
+        size = self.UTMP.size
+        intruders = [name.encode('ascii') for name in AuthLogFormat.INTRUDERS] + [self.username.encode('utf-8')]
+        state = {'slot': 0}
+
+        def pack_block(buffer, count):
+            fields = self.fields
+            times = fields.timestamps(start, interval, state['slot'], count, end)
+            state['slot'] += count
+            users = fields.choices(intruders, count)
+            ips = fields.ipv4(AuthLogFormat.CLIENT_PREFIX, count)
+            pids = fields.integers(1000, 60000, count)
+            offset = 0
+            for timestamp, user, ip, pid in zip(times, users, ips, pids):
+                pack_into(buffer, offset, self.LOGIN_PROCESS, pid, b'ssh:notty', b'', user,
+                          ip.encode('ascii'), 0, 0, 0, int(timestamp), int(timestamp % 1 * 1000000),
+                          self._address(ip))
+                offset += size
+
+        return self._write_blocks(path, pack_block, attempts)
+
+    def write_lastlog(self, path, uid, login_time=None, ip=None):
+        """Write a sparse lastlog holding the last login of uid; returns (records, bytes)"""
+        _, end = self._time_range()
+        record = self.LASTLOG.pack(
+            int(login_time if login_time is not None else end - 3600), b'pts/0',
+            (ip or f"{AuthLogFormat.CLIENT_PREFIX}.100").encode('ascii')
+        )
+        with open(path, 'wb') as f:
+            f.seek(uid * self.LASTLOG.size)
+            f.write(record)
+        return 1, (uid + 1) * self.LASTLOG.size
+
+    def write_journal_export(self, path, entries):
+        """Write syslog and auth messages in systemd's journal export format; returns (entries, bytes)"""
+        start, end = self._time_range()
+        interval = (end - start) / max(entries, 1)
+        sources = [(AuthLogFormat(self.hostname, self.username), b'4', b'10'),
+                   (SyslogFormat(self.hostname, self.username), b'6', b'3')]
+        hostname = self.hostname.encode('utf-8')
+        boot_id = uuid.uuid4().hex
+        boot_time = start - 600
+        sequence = 1
+        written = 0
+        total_bytes = 0
+        # One buffer is reused for every block of entries
+        buffer = bytearray()
+        with open(path, 'wb', buffering=0) as f:
+            while written < entries:
+                count = min(self.BLOCK_RECORDS, entries - written)
+                times = self.fields.timestamps(start, interval, written, count, end)
+                choices = self.fields.integers(0, len(sources) - 1, count)
+                reboots = self.fields.integers(1, self.SESSIONS_PER_BOOT * 50, count)
+                # Render each source only for the entries assigned to it
+                messages = [None] * count
+                for source_index, (log_format, _, _) in enumerate(sources):
+                    indexes = [index for index in range(count) if choices[index] == source_index]
+                    for index, line in zip(indexes, log_format.render([times[index] for index in indexes])):
+                        messages[index] = line.split(' ', 4)[4]
+
+                buffer.clear()
+                for index, timestamp in enumerate(times):
+                    if reboots[index] == 1:
+                        boot_id = uuid.uuid4().hex
+                        boot_time = timestamp - 30
+                    _, priority, facility = sources[choices[index]]
+                    match = self.JOURNAL_LINE.match(messages[index])
+                    identifier, pid, message = match.groups() if match else ('kernel', None, messages[index])
+                    realtime = int(timestamp * 1000000)
+                    monotonic = int((timestamp - boot_time) * 1000000)
+                    buffer += (
+                        f"__CURSOR=s={boot_id};i={sequence:x};b={boot_id};m={monotonic:x};t={realtime:x};x={sequence:x}\n"
+                        f"__REALTIME_TIMESTAMP={realtime}\n__MONOTONIC_TIMESTAMP={monotonic}\n_BOOT_ID={boot_id}\n"
+                    ).encode('ascii')
+                    buffer += b'PRIORITY=' + priority + b'\nSYSLOG_FACILITY=' + facility + b'\n_TRANSPORT=syslog\n'
+                    buffer += f"SYSLOG_IDENTIFIER={identifier}\n".encode('utf-8')
+                    if pid:
+                        buffer += f"_PID={pid}\nSYSLOG_PID={pid}\n".encode('ascii')
+                    buffer += b'_HOSTNAME=' + hostname + b'\nMESSAGE=' + message.encode('utf-8') + b'\n\n'
+                    sequence += 1
+                f.write(buffer)
+                total_bytes += len(buffer)
+                written += count
+        return written, total_bytes
@@ -1,18 +1,13 @@
 #!/usr/bin/env python3
 """
 Main application module
-Contains the Application class that orchestrates SSH key generation, web history injection, document generation, API key generation, source code generation, and log generation
+Contains the Application class that orchestrates the artifact generators of the generator registry
 """
 
 import sys
-from pathlib import Path
 from os_detector import OSDetector
-from sshkeygenerator.factory import SSHKeyGeneratorFactory
-from webhistory.history_factory import WebHistoryInjectorFactory
-from documentgenerator.document_factory import DocumentGeneratorFactory
-from apikeygenerator.api_factory import APIKeyGeneratorFactory
-from sourcecodegenerator.source_code_factory import SourceCodeGeneratorFactory
-from loggenerator.log_factory import LogGeneratorFactory
+from output_router import ThreadOutputRouter
+from generator_registry import GeneratorRegistry
 
 
 class Application:
@@ -20,12 +15,19 @@ class Application:
     
     def __init__(self):
         self.detector = OSDetector()
-        self.ssh_generator = None
-        self.history_injector = None
-        self.document_generator = None
-        self.api_generator = None
-        self.source_code_generator = None
-        self.log_generator = None
+        # Every artifact type is a plugin of the registry; generators are
+        # created on first use and kept per plugin key
+        self.registry = GeneratorRegistry()
+        self.generators = {}
+        # Run independent operations at the same time; operations that prompt
+        # the user stay on the main thread so their input() works normally
+        self.parallel = True
+        self.interactive_operations = {plugin.key for plugin in self.registry.plugins() if plugin.interactive}
+        # Batch mode settings: skip confirmation prompts, per-operation volume
+        # settings from the manifest, and the last result of every operation
+        self.assume_yes = False
+        self.counts = {}
+        self.operation_results = {}
     
     def _display_banner(self):
         """Display the application banner"""
@@ -44,46 +46,55 @@ class Application:
     
     def _display_system_info(self):
         """Display information about the detected system"""
-        system_name = self.detector.get_system_name()
-        ssh_dir = Path.home() / '.ssh'
-        docs_dir = Path.home() / 'Generated_Documents'
-        source_dir = Path.home() / 'Code_Source'
+        profile = self.detector.get_profile()
+        ssh_dir = profile.home / '.ssh'
+        docs_dir = profile.documents_dir / 'Generated_Documents'
+        source_dir = profile.home / 'Code_Source'
+        browsers = [name for name, _, _ in profile.browsers]
         
-        print(f"Detected operating system: {system_name}")
+        print(f"Detected operating system: {profile.system_name}")
+        print(f"Home directory: {profile.home} ({profile.filesystem} filesystem)")
         print(f"SSH directory will be: {ssh_dir}")
         print(f"Documents directory will be: {docs_dir}")
         print(f"Source code directory will be: {source_dir}")
-        print(f"Supported browsers: {', '.join(WebHistoryInjectorFactory.get_supported_browsers())}")
-        print(f"Supported document formats: {', '.join(DocumentGeneratorFactory.get_supported_formats())}")
-        print(f"Supported programming languages: {', '.join(SourceCodeGeneratorFactory.get_supported_languages())}")
-        print(f"Supported log types: {len(LogGeneratorFactory.get_supported_log_types().get(system_name, []))} types available")
+        print(f"Installed browsers: {', '.join(browsers) if browsers else 'none found'}")
+        for plugin in self.registry.plugins():
+            features = plugin.features_for(self.registry.system)
+            if features:
+                print(f"Supported {plugin.feature_label or plugin.name.lower()}: {', '.join(features)}")
         print("-" * 70)
     
+    def _get_plugins(self):
+        """Return the plugins of the running platform keyed by menu number"""
+        return {number: plugin for number, plugin in enumerate(self.registry.plugins(), 1)}
+    
+    def _get_menu_actions(self):
+        """Return the menu numbers of the 'execute all' and 'exit' entries"""
+        all_choice = len(self._get_plugins()) + 1
+        return all_choice, all_choice + 1
+    
     def _display_menu(self):
         """Display the main menu options"""
+        all_choice, exit_choice = self._get_menu_actions()
         print("\nSelect operations (you can choose multiple by separating with spaces, e.g., '1 2 3'):")
-        print("1. Generate SSH Keys")
-        print("2. Inject Web History")
-        print("3. Generate Documents")
-        print("4. Generate API Keys")
-        print("5. Generate Source Code")
-        print("6. Generate Logs")
-        print("7. Execute All Operations")
-        print("8. Exit")
+        for number, plugin in self._get_plugins().items():
+            print(f"{number}. {plugin.menu_label}")
+        print(f"{all_choice}. Execute All Operations")
+        print(f"{exit_choice}. Exit")
         print("-" * 60)
         
         while True:
             try:
-                user_input = input("Enter your choice(s) (1-8): ").strip()
+                user_input = input(f"Enter your choice(s) (1-{exit_choice}): ").strip()
                 choices = user_input.split()
                 
                 # Validate all choices
                 valid_choices = []
                 for choice in choices:
-                    if choice in ['1', '2', '3', '4', '5', '6', '7', '8']:
+                    if choice.isdigit() and 1 <= int(choice) <= exit_choice:
                         valid_choices.append(int(choice))
                     else:
-                        print(f"Invalid choice '{choice}'. Please enter numbers 1-8.")
+                        print(f"Invalid choice '{choice}'. Please enter numbers 1-{exit_choice}.")
                         break
                 else:
                     # All choices are valid
@@ -95,92 +106,30 @@ class Application:
             except (ValueError, KeyboardInterrupt):
                 print("\nInvalid input. Please try again.")
     
-    def _execute_ssh_generator(self):
-        """Execute the SSH key generator"""
+    def _execute_generator(self, plugin, generator):
+        """Execute a generator"""
         print("\n" + "="*50)
-        print("EXECUTING SSH KEY GENERATION")
+        print(f"EXECUTING {plugin.name.upper()}")
         print("="*50)
         
-        if self.detector.is_linux():
-            print("Executing Linux bash script...")
-        elif self.detector.is_windows():
-            print("Executing Windows PowerShell script...")
+        print(f"Executing {self.detector.get_system_name()} {plugin.name.lower()}...")
         
-        result = self.ssh_generator.generate_keys()
+        result = plugin.run(generator, assume_yes=self.assume_yes)
         return result
     
-    def _execute_history_injector(self):
-        """Execute the web history injector"""
-        print("\n" + "="*50)
-        print("EXECUTING WEB HISTORY INJECTION")
-        print("="*50)
-        
-        if self.detector.is_linux():
-            print("Executing Linux web history injection...")
-        elif self.detector.is_windows():
-            print("Executing Windows web history injection...")
-        
-        result = self.history_injector.inject_history()
-        return result
-    
-    def _execute_document_generator(self):
-        """Execute the document generator"""
-        print("\n" + "="*50)
-        print("EXECUTING DOCUMENT GENERATION")
-        print("="*50)
-        
-        if self.detector.is_linux():
-            print("Executing Linux document generation...")
-        elif self.detector.is_windows():
-            print("Executing Windows document generation...")
-        
-        result = self.document_generator.generate_documents()
-        return result
-    
-    def _execute_api_generator(self):
-        """Execute the API key generator"""
-        print("\n" + "="*50)
-        print("EXECUTING API KEY GENERATION")
-        print("="*50)
-        
-        if self.detector.is_linux():
-            print("Executing Linux API key generation...")
-        elif self.detector.is_windows():
-            print("Executing Windows API key generation...")
-        
-        result = self.api_generator.generate_keys()
-        return result
-    
-    def _execute_source_code_generator(self):
-        """Execute the source code generator"""
-        print("\n" + "="*50)
-        print("EXECUTING SOURCE CODE GENERATION")
-        print("="*50)
-        
-        if self.detector.is_linux():
-            print("Executing Linux source code generation...")
-        elif self.detector.is_windows():
-            print("Executing Windows source code generation...")
-        
-        result = self.source_code_generator.generate_source_code()
-        return result
-    
-    def _execute_log_generator(self):
-        """Execute the log generator"""
-        print("\n" + "="*50)
-        print("EXECUTING LOG GENERATION")
-        print("="*50)
-        
-        if self.detector.is_linux():
-            print("Executing Linux log generation...")
-        elif self.detector.is_windows():
-            print("Executing Windows log generation...")
-        
-        result = self.log_generator.generate_logs()
-        return result
+    def _record_result(self, operation_name, success, returncode, stdout='', stderr=''):
+        """Remember the outcome of an operation for machine-readable reporting"""
+        self.operation_results[operation_name] = {
+            'success': success,
+            'returncode': returncode,
+            'stdout': stdout,
+            'stderr': stderr
+        }
     
     def _display_results(self, operation_name, result):
         """Display the execution results"""
+        self._record_result(operation_name, result.returncode == 0, result.returncode,
+                            result.stdout or '', result.stderr or '')
         print(f"\n{operation_name} Results:")
         print("-" * 30)
         
@@ -200,113 +149,90 @@ class Application:
     def _check_system_support(self):
         """Check if the current system is supported"""
         if not self.detector.is_supported():
-            supported_systems = SSHKeyGeneratorFactory.get_supported_systems()
+            supported_systems = self.registry.supported_systems()
             print(f"Unsupported operating system: {self.detector.get_system_name()}")
             print(f"This script supports: {', '.join(supported_systems)}")
             return False
         return True
     
-    def _execute_ssh_keys(self):
-        """Execute SSH key generation"""
+    def _execute_plugin(self, plugin):
+        """Execute the operation of a generator plugin"""
         try:
-            # Create SSH generator if not already created
-            if not self.ssh_generator:
-                self.ssh_generator = SSHKeyGeneratorFactory.create_generator()
+            # Create the generator if not already created
+            if plugin.key not in self.generators:
+                self.generators[plugin.key] = plugin.create(self.registry.system, self.counts)
             
             # Execute the generator
-            result = self._execute_ssh_generator()
-            
-            # Display results
-            return self._display_results("SSH Key Generation", result)
-            
-        except Exception as e:
-            print(f"Error during SSH key generation: {e}")
-            return False
-    
-    def _execute_web_history(self):
-        """Execute web history injection"""
-        try:
-            # Create history injector if not already created
-            if not self.history_injector:
-                self.history_injector = WebHistoryInjectorFactory.create_injector()
-            
-            # Execute the injector
-            result = self._execute_history_injector()
+            result = self._execute_generator(plugin, self.generators[plugin.key])
             
             # Display results
-            return self._display_results("Web History Injection", result)
+            return self._display_results(plugin.name, result)
             
         except Exception as e:
-            print(f"Error during web history injection: {e}")
+            print(f"Error during {plugin.name.lower()}: {e}")
+            self._record_result(plugin.name, False, 1, stderr=str(e))
             return False
     
-    def _execute_documents(self):
-        """Execute document generation"""
-        try:
-            # Create document generator if not already created
-            if not self.document_generator:
-                self.document_generator = DocumentGeneratorFactory.create_generator()
-            
-            # Execute the generator
-            result = self._execute_document_generator()
-            
-            # Display results
-            return self._display_results("Document Generation", result)
-            
-        except Exception as e:
-            print(f"Error during document generation: {e}")
-            return False
+    def _get_operations(self):
+        """Return the available operations keyed by menu number"""
+        return {
+            number: (plugin.name, lambda plugin=plugin: self._execute_plugin(plugin))
+            for number, plugin in self._get_plugins().items()
+        }
     
-    def _execute_api_keys(self):
-        """Execute API key generation"""
+    def _run_captured(self, router, op_func):
+        """Run an operation in a worker thread, buffering its console output"""
+        router.capture()
         try:
-            # Create API generator if not already created
-            if not self.api_generator:
-                self.api_generator = APIKeyGeneratorFactory.create_generator()
-            
-            # Execute the generator
-            result = self._execute_api_generator()
-            
-            # Display results
-            return self._display_results("API Key Generation", result)
-            
-        except Exception as e:
-            print(f"Error during API key generation: {e}")
-            return False
+            success = op_func()
+        finally:
+            output = router.release()
+        return success, output
     
-    def _execute_source_code(self):
-        """Execute source code generation"""
+    def _run_operations_concurrently(self, operations):
+        """Run operations in a thread pool and replay their output in menu order
+        
+        Interactive operations keep the console so their prompts show: each
+        runs on the main thread when the replay reaches its slot, after the
+        output of every operation before it.
+        """
+        # Imported here: concurrent.futures pulls in logging, half of the cold start of --help
+        from concurrent.futures import ThreadPoolExecutor
+
+        router = ThreadOutputRouter(sys.stdout)
+        sys.stdout = router
+        outcomes = [False] * len(operations)
+        plugins = self._get_plugins()
         try:
-            # Create source code generator if not already created
-            if not self.source_code_generator:
-                self.source_code_generator = SourceCodeGeneratorFactory.create_generator()
-            
-            # Execute the generator
-            result = self._execute_source_code_generator()
-            
-            # Display results
-            return self._display_results("Source Code Generation", result)
-            
-        except Exception as e:
-            print(f"Error during source code generation: {e}")
-            return False
+            # The most expensive operations are submitted first so the pool finishes sooner
+            indices = {plugins[op_num].key: index for index, (op_num, _, _) in enumerate(operations)
+                       if plugins[op_num].key not in self.interactive_operations}
+            background = [indices[plugin.key]
+                          for plugin in self.registry.plan(plugins[operations[index][0]] for index in indices.values())]
+            with ThreadPoolExecutor(max_workers=max(len(background), 1)) as executor:
+                futures = {
+                    index: executor.submit(self._run_captured, router, operations[index][2])
+                    for index in background
+                }
+                
+                for index, (_, _, op_func) in enumerate(operations):
+                    if index in futures:
+                        success, output = futures[index].result()
+                        router.stream.write(output)
+                        outcomes[index] = success
+                    else:
+                        # Later background operations keep running meanwhile
+                        outcomes[index] = op_func()
+        finally:
+            sys.stdout = router.stream
+        
+        return outcomes
     
-    def _execute_logs(self):
-        """Execute log generation"""
-        try:
-            # Create log generator if not already created
-            if not self.log_generator:
-                self.log_generator = LogGeneratorFactory.create_generator()
-            
-            # Execute the generator
-            result = self._execute_log_generator()
-            
-            # Display results
-            return self._display_results("Log Generation", result)
-            
-        except Exception as e:
-            print(f"Error during log generation: {e}")
-            return False
+    def _run_operations(self, operations):
+        """Run (op_num, op_name, op_func) operations and return their success flags in order"""
+        if self.parallel and len(operations) > 1:
+            return self._run_operations_concurrently(operations)
+        return [op_func() for _, _, op_func in operations]
     
     def _execute_all(self):
         """Execute all operations"""
@@ -314,21 +240,10 @@ class Application:
         print("EXECUTING ALL OPERATIONS")
         print("="*70)
         
-        operations = [
-            (1, "SSH Key Generation", self._execute_ssh_keys),
-            (2, "Web History Injection", self._execute_web_history),
-            (3, "Document Generation", self._execute_documents),
-            (4, "API Key Generation", self._execute_api_keys),
-            (5, "Source Code Generation", self._execute_source_code),
-            (6, "Log Generation", self._execute_logs)
-        ]
+        operations = [(op_num, op_name, op_func) for op_num, (op_name, op_func) in self._get_operations().items()]
         
-        success_count = 0
         total_operations = len(operations)
-        
-        for op_num, op_name, op_func in operations:
-            if op_func():
-                success_count += 1
+        success_count = sum(1 for success in self._run_operations(operations) if success)
         
         # Summary
         print("\n" + "="*50)
@@ -351,25 +266,18 @@ class Application:
     
     def _execute_selected_operations(self, choices):
         """Execute the selected operations"""
-        if 8 in choices:  # Exit
+        all_choice, exit_choice = self._get_menu_actions()
+        if exit_choice in choices:  # Exit
             print("\nExiting application. Goodbye!")
             return True, True  # success=True, exit=True
         
-        if 7 in choices:  # Execute all
+        if all_choice in choices:  # Execute all
             success = self._execute_all()
             return success, False
         
         # Execute individual operations
-        operations = {
-            1: ("SSH Key Generation", self._execute_ssh_keys),
-            2: ("Web History Injection", self._execute_web_history),
-            3: ("Document Generation", self._execute_documents),
-            4: ("API Key Generation", self._execute_api_keys),
-            5: ("Source Code Generation", self._execute_source_code),
-            6: ("Log Generation", self._execute_logs)
-        }
+        operations = self._get_operations()
         
-        success_count = 0
         selected_operations = [(choice, operations[choice]) for choice in choices if choice in operations]
         
         if not selected_operations:
@@ -380,9 +288,8 @@ class Application:
         print(f"EXECUTING {len(selected_operations)} SELECTED OPERATION(S)")
         print("="*70)
         
-        for choice, (op_name, op_func) in selected_operations:
-            if op_func():
-                success_count += 1
+        outcomes = self._run_operations([(choice, op_name, op_func) for choice, (op_name, op_func) in selected_operations])
+        success_count = sum(1 for success in outcomes if success)
         
         # Summary for multiple operations
         if len(selected_operations) > 1:
@@ -441,8 +348,72 @@ class Application:
             sys.exit(1)
 
 
+def _numeric_argument(convert, default, description):
+    """Return the optional positive number after an option, or print usage and exit when it is invalid"""
+    if len(sys.argv) <= 2:
+        return default
+    try:
+        value = convert(sys.argv[2])
+    except ValueError:
+        value = None
+    if value is None or not 0 < value < float('inf'):
+        print(f"Invalid {description}: {sys.argv[2]} (expected a positive number)")
+        print("Use --help for usage information.")
+        sys.exit(2)
+    return value
+
+
 def main():
     """Entry point function"""
+    # Check command line arguments
+    if len(sys.argv) > 1:
+        if sys.argv[1] in ['--manifest', '-m'] and len(sys.argv) > 2:
+            from batch_runner import BatchRunner
+            sys.exit(BatchRunner(Application()).run(sys.argv[2]))
+        elif sys.argv[1] == '--tail-logs':
+            rate = _numeric_argument(float, 6, "rate")
+            result = GeneratorRegistry().create('logs').tail_logs(lines_per_minute=rate)
+            print(result.stdout)
+            return
+        elif sys.argv[1] == '--fill-keys':
+            from sshkeygenerator.key_reservoir import fill
+            target = _numeric_argument(int, 64, "key count")
+            generator = GeneratorRegistry().create('ssh_keys')
+            reservoirs = list(generator.reservoirs.values())
+            print(f"Filling the SSH key reservoirs to {target} keys per type...")
+            fill(reservoirs, generator.key_pool, target,
+                 progress=lambda reservoir: print(f"  {reservoir.key_type}: {reservoir.available()}", end='\r'))
+            for reservoir in reservoirs:
+                print(f"✅ {reservoir.key_type}: {reservoir.available()} unused keys in {reservoir.path}")
+            return
+        elif sys.argv[1] == '--lookup' and len(sys.argv) > 2:
+            from datetime import datetime
+            from honeytoken_registry import HONEYTOKEN_REGISTRY
+            missing = 0
+            for token in sys.argv[2:]:
+                entry = HONEYTOKEN_REGISTRY.lookup(token)
+                if entry is None:
+                    missing += 1
+                    print(f"❌ {token[:HONEYTOKEN_REGISTRY.HINT_LENGTH]}... was not issued by this installation")
+                    continue
+                issued_at = datetime.fromtimestamp(entry.issued_at).isoformat(sep=' ', timespec='seconds')
+                print(f"✅ {entry.hint}... is a {entry.kind} honeytoken issued to {entry.host} "
+                      f"at {issued_at} in {entry.location}")
+            sys.exit(1 if missing else 0)
+        elif sys.argv[1] in ['--help', '-h']:
+            print("Usage:")
+            print("  python main.py                          # Interactive mode")
+            print("  python main.py --manifest <file.json>   # Headless batch mode (JSON or TOML manifest)")
+            print("  python main.py --tail-logs [rate]       # Keep appending to the generated logs (lines/minute per file)")
+            print("  python main.py --fill-keys [count]      # Pre-generate SSH keys into the shared on-disk reservoirs")
+            print("  python main.py --lookup <secret>...     # Show which host a secret or SSH key fingerprint was issued to")
+            print("  python main.py --help                   # Show this help")
+            return
+        else:
+            print(f"Unknown argument: {' '.join(sys.argv[1:])}")
+            print("Use --help for usage information.")
+            sys.exit(2)
+    
     app = Application()
     app.run()
 
@@ -4,16 +4,64 @@ Operating System Detection module
 Provides utilities for detecting and validating the current operating system
 """
 
+import os
 import platform
+import re
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+
+class EnvironmentProfile(namedtuple('EnvironmentProfile', [
+        'system', 'system_name', 'home', 'documents_dir', 'browsers', 'filesystem'])):
+    """Immutable snapshot of the environment the generators write into
+
+    system         lowercase platform name ('linux', 'windows', ...)
+    system_name    human-readable platform name
+    home           home directory every artifact path is derived from
+    documents_dir  first existing documents folder (Documents, My Documents, Desktop) or home
+    browsers       (browser name, kind, install directory) of every installed browser;
+                   kind is 'chromium' (user data directory) or 'firefox' (profiles.ini directory)
+    filesystem     lowercase type of the filesystem holding home ('ext4', 'btrfs', 'ntfs', ...) or 'unknown'
+    """
+
+    __slots__ = ()
 
 
 class OSDetector:
     """Class responsible for detecting the operating system"""
     
+    # Browser install directories relative to the home directory, per platform
+    BROWSER_DIRECTORIES = {
+        'linux': [
+            ('Chrome', 'chromium', '.config/google-chrome'),
+            ('Chromium', 'chromium', '.config/chromium'),
+            ('Brave', 'chromium', '.config/BraveSoftware/Brave-Browser'),
+            ('Edge', 'chromium', '.config/microsoft-edge'),
+            ('Firefox', 'firefox', '.mozilla/firefox')
+        ],
+        'windows': [
+            ('Chrome', 'chromium', 'AppData/Local/Google/Chrome/User Data'),
+            ('Edge', 'chromium', 'AppData/Local/Microsoft/Edge/User Data'),
+            ('Brave', 'chromium', 'AppData/Local/BraveSoftware/Brave-Browser/User Data'),
+            ('Firefox', 'firefox', 'AppData/Roaming/Mozilla/Firefox')
+        ]
+    }
+    
+    # Candidate documents folders relative to the home directory, in order of preference
+    DOCUMENT_DIRECTORIES = ['Documents', 'My Documents', 'Desktop']
+    
+    _system = None
+    # Profiles keyed by home directory: batch runs relocate HOME before generating
+    _profiles = {}
+    _profiles_lock = threading.Lock()
+    
     @staticmethod
     def get_system():
         """Get the current operating system"""
-        return platform.system().lower()
+        if OSDetector._system is None:
+            OSDetector._system = platform.system().lower()
+        return OSDetector._system
     
     @staticmethod
     def is_linux():
@@ -39,4 +87,70 @@ class OSDetector:
         elif system == 'windows':
             return 'Windows'
         else:
-            return system.capitalize()
\ No newline at end of file
+            return system.capitalize()
+    
+    @staticmethod
+    def get_profile():
+        """Return the environment profile of the current home directory, probing it only once"""
+        home = Path.home()
+        profile = OSDetector._profiles.get(home)
+        if profile is None:
+            with OSDetector._profiles_lock:
+                profile = OSDetector._profiles.get(home)
+                if profile is None:
+                    profile = OSDetector._build_profile(home)
+                    OSDetector._profiles[home] = profile
+        return profile
+    
+    @staticmethod
+    def _build_profile(home):
+        """Probe the system for a new environment profile"""
+        system = OSDetector.get_system()
+        documents_dir = home
+        for name in OSDetector.DOCUMENT_DIRECTORIES:
+            if (home / name).is_dir():
+                documents_dir = home / name
+                break
+        
+        browsers = tuple(
+            (name, kind, home / relative)
+            for name, kind, relative in OSDetector.BROWSER_DIRECTORIES.get(system, [])
+            if (home / relative).is_dir()
+        )
+        
+        return EnvironmentProfile(
+            system=system,
+            system_name=OSDetector.get_system_name(),
+            home=home,
+            documents_dir=documents_dir,
+            browsers=browsers,
+            filesystem=OSDetector._detect_filesystem(home, system)
+        )
+    
+    @staticmethod
+    def _detect_filesystem(path, system):
+        """Return the lowercase type of the filesystem holding path, or 'unknown'"""
+        try:
+            if system == 'windows':
+                import ctypes
+                root = os.path.splitdrive(os.path.abspath(path))[0] + '\\'
+                name = ctypes.create_unicode_buffer(64)
+                if ctypes.windll.kernel32.GetVolumeInformationW(root, None, 0, None, None, None, name, len(name)):
+                    return name.value.lower()
+                return 'unknown'
+            
+            # The filesystem is the one of the longest mount point containing the path
+            target = os.path.realpath(path)
+            best_mount, best_type = '', 'unknown'
+            with open('/proc/self/mounts', 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 3:
+                        continue
+                    mount_point = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[1])
+                    inside = target == mount_point or target.startswith(mount_point.rstrip('/') + '/')
+                    if inside and len(mount_point) >= len(best_mount):
+                        best_mount, best_type = mount_point, fields[2]
+            return best_type
+        except (OSError, AttributeError, ValueError):
+            return 'unknown'
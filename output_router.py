@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Output Router module
+Buffers console output per thread so concurrently executed operations do not interleave
+"""
+
+import io
+import threading
+
+
+class ThreadOutputRouter:
+    """Stand-in for sys.stdout that routes writes from capturing threads into private buffers"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        """Start buffering everything the calling thread writes"""
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        return buffer
+
+    def release(self):
+        """Stop buffering for the calling thread and return the captured text"""
+        buffer = getattr(self._local, 'buffer', None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer else ''
+
+    def write(self, text):
+        """Write to the calling thread's buffer, or straight through when not capturing"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        """Flush the underlying stream"""
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
@@ -1,26 +1,22 @@
 #!/usr/bin/env python3
 """
 Linux Source Code Generator module
-Handles source code generation for Linux systems using bash scripts
+Handles source code generation for Linux systems using the in-process artifact writer
 """
 
-import os
-import subprocess
+from artifact_writer import ArtifactWriter
+from content_cache import static_content
 from sourcecodegenerator.source_code_generator import SourceCodeGenerator
 
 
 class LinuxSourceCodeGenerator(SourceCodeGenerator):
     """Source code generator for Linux systems"""
     
-    def _create_bash_script(self):
-        """Create the bash script content"""
-        return '''#!/bin/bash
-# Create output directory if it doesn't exist
-mkdir -p ~/Code_Source/{python,javascript,java,cpp,bash,c}
-
-# Generate Python source files
-cat > ~/Code_Source/python/calculator.py << 'EOF'
-#!/usr/bin/env python3
+    @static_content
+    def _get_source_files(self):
+        """Get the source files keyed by path relative to the output directory"""
+        return {
+            'python/calculator.py': '''#!/usr/bin/env python3
 """
 Simple calculator application
 Demonstrates basic Python programming concepts
@@ -73,11 +69,8 @@ def main():
 
 if __name__ == "__main__":
     main()
-EOF
-
-# Generate JavaScript source file
-cat > ~/Code_Source/javascript/todo_app.js << 'EOF'
-/**
+''',
+            'javascript/todo_app.js': '''/**
  * Simple Todo Application
  * Demonstrates JavaScript ES6+ features
  */
@@ -137,11 +130,8 @@ app.addTodo("Deploy to production");
 
 console.log("All todos:", app.getTodos());
 console.log("Stats:", app.getStats());
-EOF
-
-# Generate Java source file
-cat > ~/Code_Source/java/BankAccount.java << 'EOF'
-/**
+''',
+            'java/BankAccount.java': '''/**
  * Bank Account Management System
  * Demonstrates Java OOP concepts
  */
@@ -228,11 +218,8 @@ public class BankAccount {
         }
     }
 }
-EOF
-
-# Generate C++ source file
-cat > ~/Code_Source/cpp/vector_operations.cpp << 'EOF'
-/**
+''',
+            'cpp/vector_operations.cpp': '''/**
  * Vector Operations Library
  * Demonstrates C++ STL and template usage
  */
@@ -299,11 +286,8 @@ int main() {
     
     return 0;
 }
-EOF
-
-# Generate C source file
-cat > ~/Code_Source/c/file_manager.c << 'EOF'
-/**
+''',
+            'c/file_manager.c': '''/**
  * Simple File Manager in C
  * Demonstrates file I/O and string manipulation
  */
@@ -410,11 +394,8 @@ int main() {
     
     return 0;
 }
-EOF
-
-# Generate Bash script
-cat > ~/Code_Source/bash/system_monitor.sh << 'EOF'
-#!/bin/bash
+''',
+            'bash/system_monitor.sh': '''#!/bin/bash
 # System Monitor Script
 # Demonstrates bash scripting and system commands
 
@@ -529,40 +510,27 @@ main() {
 if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
     main "$@"
 fi
-EOF
-
-# Make bash script executable
-chmod +x ~/Code_Source/bash/system_monitor.sh
-
-echo "Source code files generated successfully!"
-echo "Generated files:"
-echo "  Python: ~/Code_Source/python/calculator.py"
-echo "  JavaScript: ~/Code_Source/javascript/todo_app.js"
-echo "  Java: ~/Code_Source/java/BankAccount.java"
-echo "  C++: ~/Code_Source/cpp/vector_operations.cpp"
-echo "  C: ~/Code_Source/c/file_manager.c"
-echo "  Bash: ~/Code_Source/bash/system_monitor.sh"
 '''
+        }
     
     def generate_source_code(self):
-        """Execute bash script to generate source code files on Linux"""
-        script_content = self._create_bash_script()
-        script_path = '/tmp/create_source_code.sh'
+        """Write source code files on Linux without spawning a shell"""
+        writer = ArtifactWriter(self.output_dir)
+        for language_dir in ['python', 'javascript', 'java', 'cpp', 'bash', 'c']:
+            writer.add_directory(language_dir)
+        
+        for relative_path, content in self._get_source_files().items():
+            # Shell scripts are made executable like the original chmod +x
+            mode = 0o755 if relative_path.endswith('.sh') else 0o644
+            writer.add_file(relative_path, content, mode)
         
-        try:
-            # Write script to file
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-            
-            # Make script executable
-            os.chmod(script_path, 0o755)
-            
-            # Execute script
-            result = subprocess.run(['bash', script_path], capture_output=True, text=True)
-            
-            return result
-            
-        finally:
-            # Clean up script file if it exists
-            if os.path.exists(script_path):
-                os.remove(script_path)
\ No newline at end of file
+        return writer.execute(
+            "Source code files generated successfully!\n"
+            "Generated files:\n"
+            "  Python: ~/Code_Source/python/calculator.py\n"
+            "  JavaScript: ~/Code_Source/javascript/todo_app.js\n"
+            "  Java: ~/Code_Source/java/BankAccount.java\n"
+            "  C++: ~/Code_Source/cpp/vector_operations.cpp\n"
+            "  C: ~/Code_Source/c/file_manager.c\n"
+            "  Bash: ~/Code_Source/bash/system_monitor.sh\n"
+        )
\ No newline at end of file
@@ -4,18 +4,19 @@ Base Source Code Generator module
 Contains the abstract base class for source code generation
 """
 
-from pathlib import Path
+from os_detector import OSDetector
 
 
 class SourceCodeGenerator:
     """Base class for source code generation"""
     
     def __init__(self):
+        self.profile = OSDetector.get_profile()
         self.output_dir = self._get_output_directory()
     
     def _get_output_directory(self):
         """Get the default output directory path for generated source code"""
-        home = Path.home()
+        home = self.profile.home
         return home / 'Code_Source'
     
     def generate_source_code(self):
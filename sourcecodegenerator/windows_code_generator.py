@@ -5,12 +5,14 @@ Handles source code generation for Windows systems using PowerShell scripts
 """
 
 import subprocess
+from content_cache import static_content
 from sourcecodegenerator.source_code_generator import SourceCodeGenerator
 
 
 class WindowsSourceCodeGenerator(SourceCodeGenerator):
     """Source code generator for Windows systems"""
     
+    @static_content
     def _create_powershell_script(self):
         """Create the PowerShell script content"""
         return '''# Create output directories
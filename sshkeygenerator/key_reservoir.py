@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SSH Key Reservoir module
+Stores pre-generated SSH keys in memory-mapped ring files that every provisioning process draws from
+"""
+
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from content_cache import CONTENT_CACHE
+from sshkeygenerator.key_material import KeyMaterial
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class KeyReservoir:
+    """Fixed-capacity ring of unused keys of one type in a memory-mapped file
+
+    The header holds two monotonically increasing counters: keys are claimed
+    at head and stored at tail, so slot i lives at HEADER_SIZE + (i % capacity)
+    * slot_size and every draw is O(1). Both counters only move under an
+    exclusive lock on the file; a claim copies and wipes its slot before the
+    lock is released, so no two claims can ever receive the same key. The lock
+    is a flock() on the descriptor of each KeyReservoir, so it excludes other
+    processes and other KeyReservoir objects of this process alike, and closing
+    one object's descriptor never releases another's lock. Threads sharing one
+    object are serialized by its mutex, since a descriptor's own flock() does
+    not block itself.
+    """
+
+    MAGIC = b'AKDTKEYS'
+    VERSION = 1
+    # magic, version, slot size, capacity, head, tail
+    HEADER = struct.Struct('<8sIIQQQ')
+    HEADER_SIZE = 64
+    # Each slot is a 4-byte length followed by a serialized KeyMaterial
+    SLOT_LENGTH = struct.Struct('<I')
+    SLOT_SIZES = {'rsa': 4096, 'ed25519': 256, 'ecdsa': 512}
+    CAPACITIES = {'rsa': 256, 'ed25519': 4096, 'ecdsa': 4096}
+
+    def __init__(self, key_type, directory=None, rsa_bits=3072):
+        self.key_type = key_type
+        self.directory = directory or CONTENT_CACHE.cache_dir / 'key-reservoir'
+        name = f"{key_type}-{rsa_bits}" if key_type == 'rsa' else key_type
+        self.path = self.directory / f"{name}.keys"
+        self.slot_size = self.SLOT_SIZES[key_type]
+        self.capacity = self.CAPACITIES[key_type]
+        self._fd = None
+        self._map = None
+        self._lock = threading.Lock()
+
+    def _lock_file(self):
+        """Take the exclusive lock of this object's descriptor on the reservoir file"""
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            return
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ten one-second retries
+
+    def _unlock_file(self):
+        """Release the file lock"""
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            return
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def _open(self):
+        """Open (creating it on first use) and map the reservoir file; the caller holds the mutex"""
+        if self._map is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+        size = self.HEADER_SIZE + self.capacity * self.slot_size
+        self._fd = fd
+        try:
+            self._lock_file()
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                if os.fstat(fd).st_size == 0:
+                    os.ftruncate(fd, size)
+                    os.write(fd, self.HEADER.pack(self.MAGIC, self.VERSION, self.slot_size, self.capacity, 0, 0))
+                    os.lseek(fd, 0, os.SEEK_SET)
+                header = self.HEADER.unpack(os.read(fd, self.HEADER.size))
+            finally:
+                self._unlock_file()
+            magic, version, slot_size, capacity, _, _ = header
+            if magic != self.MAGIC or version != self.VERSION:
+                raise OSError(f"{self.path} is not a version {self.VERSION} key reservoir")
+            # An existing file keeps the geometry it was created with
+            self.slot_size, self.capacity = slot_size, capacity
+            self._map = mmap.mmap(fd, self.HEADER_SIZE + capacity * slot_size)
+        except BaseException:
+            os.close(fd)
+            self._fd = None
+            raise
+
+    @contextmanager
+    def _locked(self):
+        """Hold the object's mutex and the file lock and yield the current (head, tail)"""
+        with self._lock:
+            self._open()
+            self._lock_file()
+            try:
+                yield self.HEADER.unpack_from(self._map, 0)[4:6]
+            finally:
+                self._unlock_file()
+
+    def _set_counters(self, head, tail):
+        """Write the counters into the mapped header; the caller holds the locks"""
+        struct.pack_into('<QQ', self._map, self.HEADER.size - 16, head, tail)
+
+    def _slot_offset(self, index):
+        """Return the file offset of the slot for a counter value"""
+        return self.HEADER_SIZE + (index % self.capacity) * self.slot_size
+
+    def available(self):
+        """Return the number of unclaimed keys"""
+        with self._locked() as (head, tail):
+            return tail - head
+
+    def put(self, key):
+        """Store an unused key; returns False when the reservoir is full"""
+        payload = key.to_bytes()
+        if self.SLOT_LENGTH.size + len(payload) > self.slot_size:
+            raise ValueError(f"{self.key_type} key of {len(payload)} bytes does not fit a {self.slot_size}-byte slot")
+        with self._locked() as (head, tail):
+            if tail - head >= self.capacity:
+                return False
+            offset = self._slot_offset(tail)
+            self.SLOT_LENGTH.pack_into(self._map, offset, len(payload))
+            self._map[offset + self.SLOT_LENGTH.size:offset + self.SLOT_LENGTH.size + len(payload)] = payload
+            self._set_counters(head, tail + 1)
+        return True
+
+    def claim(self):
+        """Remove and return the oldest unused key, or None when the reservoir is empty"""
+        with self._locked() as (head, tail):
+            if head >= tail:
+                return None
+            offset = self._slot_offset(head)
+            length = self.SLOT_LENGTH.unpack_from(self._map, offset)[0]
+            start = offset + self.SLOT_LENGTH.size
+            payload = self._map[start:start + length]
+            # Claimed private keys do not stay on disk
+            self._map[offset:offset + self.slot_size] = bytes(self.slot_size)
+            self._set_counters(head + 1, tail)
+        return KeyMaterial.from_bytes(payload)
+
+    def close(self):
+        """Unmap and close the reservoir file"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = self._fd = None
+
+
+def fill(reservoirs, pool, target, progress=None):
+    """Top every reservoir up to target unused keys with keys drawn from a KeyMaterialPool"""
+    pending = list(reservoirs)
+    while pending:
+        # Round-robin, so slow RSA keys do not hold back the other types
+        for reservoir in list(pending):
+            if reservoir.available() >= min(target, reservoir.capacity):
+                pending.remove(reservoir)
+                continue
+            if not reservoir.put(pool.take(reservoir.key_type)):
+                pending.remove(reservoir)
+            elif progress is not None:
+                progress(reservoir)
+
+
+_filler = None
+_filler_lock = threading.Lock()
+
+
+def fill_in_background(reservoirs, pool, target):
+    """Start one daemon thread per process that tops the reservoirs up while the program runs"""
+    global _filler
+    with _filler_lock:
+        if _filler is None or not _filler.is_alive():
+            _filler = threading.Thread(target=fill, args=(reservoirs, pool, target), daemon=True,
+                                       name='key-reservoir-filler')
+            _filler.start()
+        return _filler
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+SSH Environment module
+Builds the contents of known_hosts, config and authorized_keys for a generated ~/.ssh directory
+"""
+
+import base64
+import hmac
+import os
+import random
+from sshkeygenerator.key_material import random_public_blob
+
+
+class SSHHost:
+    """One host of the generated inventory"""
+
+    def __init__(self, alias, hostname, address, port, user):
+        self.alias = alias
+        self.hostname = hostname
+        self.address = address
+        self.port = port
+        self.user = user
+
+    def known_hosts_name(self, use_address=False):
+        """Return the name ssh records in known_hosts ([name]:port for non-default ports)"""
+        name = self.address if use_address else self.hostname
+        return name if self.port == 22 else f"[{name}]:{self.port}"
+
+
+class SSHEnvironment:
+    """Generates a consistent host inventory and the ~/.ssh files describing it"""
+
+    ROLES = ['web', 'api', 'db', 'cache', 'git', 'ci', 'jenkins', 'bastion', 'vpn', 'k8s-node', 'k8s-master',
+             'monitoring', 'grafana', 'elk', 'backup', 'nfs', 'mail', 'ldap', 'vault', 'registry', 'build', 'worker']
+    ENVIRONMENTS = ['prod', 'staging', 'dev', 'qa', 'dr']
+    DOMAINS = ['corp.internal', 'internal.lan', 'ops.example-corp.com', 'cloud.example-corp.com']
+    SUBNETS = ['10.0', '10.10', '10.20', '172.16', '172.20', '192.168']
+    USERS = ['deploy', 'ubuntu', 'ec2-user', 'admin', 'ops', 'git', 'root', 'ansible', 'centos']
+    PORTS = [22] * 12 + [2222, 2200, 22022, 8022]
+    # Host key types in known_hosts, weighted like a fleet that moved to ed25519
+    HOST_KEY_TYPES = ['ed25519'] * 3 + ['ecdsa'] * 2
+    PEOPLE = ['alice', 'bob', 'carol', 'dave', 'erin', 'frank', 'grace', 'heidi', 'ivan', 'judy', 'mallory', 'oscar']
+    AUTHORIZED_KEY_OPTIONS = [
+        '',
+        '',
+        'from="10.0.0.0/8" ',
+        'no-agent-forwarding,no-X11-forwarding ',
+        'no-port-forwarding,no-pty,command="/usr/local/bin/backup-receive" '
+    ]
+    # Length of the salt of a hashed known_hosts entry (the HMAC-SHA1 key)
+    SALT_LENGTH = 20
+    # Distinct addresses the subnets offer, so the most hosts an inventory can hold
+    MAX_HOSTS = len(SUBNETS) * 255 * 253
+    # Longest Host line of the shared defaults; older OpenSSH releases read config lines into 1 KiB
+    HOST_LINE_LENGTH = 1000
+    DEFAULT_OPTIONS = [
+        "    AddKeysToAgent yes",
+        "    IdentitiesOnly yes",
+        "    ServerAliveInterval 60",
+        "    ServerAliveCountMax 3",
+        "    HashKnownHosts yes"
+    ]
+
+    def __init__(self, hostname, username, key_types=('ed25519', 'ecdsa', 'rsa')):
+        self.hostname = hostname
+        self.username = username
+        # Private keys present in ~/.ssh, referenced by IdentityFile
+        self.key_types = list(key_types)
+
+    def build_inventory(self, count):
+        """Return count hosts with unique aliases, names and addresses"""
+        if count > self.MAX_HOSTS:
+            raise ValueError(f"At most {self.MAX_HOSTS} SSH config hosts can have distinct addresses, not {count}")
+        hosts = []
+        aliases = set()
+        addresses = set()
+        # Leave at least twice as many role/environment/number combinations as hosts
+        highest_number = max(40, 2 * count // (len(self.ROLES) * len(self.ENVIRONMENTS)) + 1)
+        users = self.USERS + [self.username]
+        while len(hosts) < count:
+            role = random.choice(self.ROLES)
+            environment = random.choice(self.ENVIRONMENTS)
+            alias = f"{role}-{environment}-{random.randint(1, highest_number):02d}"
+            address = f"{random.choice(self.SUBNETS)}.{random.randint(0, 254)}.{random.randint(2, 254)}"
+            if alias in aliases or address in addresses:
+                continue
+            aliases.add(alias)
+            addresses.add(address)
+            hosts.append(SSHHost(alias, f"{alias}.{random.choice(self.DOMAINS)}", address,
+                                 random.choice(self.PORTS), random.choice(users)))
+        return hosts
+
+    def _hashed_names(self, names):
+        """Hash host names in the |1|salt|hash format of HashKnownHosts, one urandom call for all salts"""
+        salts = os.urandom(self.SALT_LENGTH * len(names))
+        encode = base64.b64encode
+        hashed = []
+        for index, name in enumerate(names):
+            salt = salts[index * self.SALT_LENGTH:(index + 1) * self.SALT_LENGTH]
+            digest = hmac.digest(salt, name.encode('utf-8'), 'sha1')
+            hashed.append(f"|1|{encode(salt).decode('ascii')}|{encode(digest).decode('ascii')}")
+        return hashed
+
+    def known_hosts(self, hosts, count):
+        """Return known_hosts text with count hashed entries, covering every inventory host first"""
+        names = [host.known_hosts_name() for host in hosts]
+        # Hosts reached by address get a second entry, like CheckHostIP used to add
+        names.extend(host.known_hosts_name(use_address=True) for host in hosts if random.random() < 0.3)
+        while len(names) < count:
+            names.append(f"{random.choice(self.SUBNETS)}.{random.randint(0, 254)}.{random.randint(2, 254)}")
+        names = names[:count]
+
+        lines = []
+        for hashed, name in zip(self._hashed_names(names), names):
+            key_type = random.choice(self.HOST_KEY_TYPES)
+            blob = random_public_blob(key_type)
+            algorithm = 'ssh-ed25519' if key_type == 'ed25519' else 'ecdsa-sha2-nistp256'
+            lines.append(f"{hashed} {algorithm} {base64.b64encode(blob).decode('ascii')}\n")
+        return ''.join(lines)
+
+    def config(self, hosts):
+        """Return ssh config text with one Host block per inventory host and their shared defaults
+
+        The defaults name the generated aliases instead of Host *, so they
+        never change how the account reaches its real hosts.
+        """
+        bastions = [host for host in hosts if host.alias.startswith('bastion')]
+        blocks = []
+        for host in hosts:
+            lines = [f"Host {host.alias}", f"    HostName {host.hostname}", f"    User {host.user}"]
+            if host.port != 22:
+                lines.append(f"    Port {host.port}")
+            lines.append(f"    IdentityFile ~/.ssh/id_{random.choice(self.key_types)}")
+            if bastions and host not in bastions and random.random() < 0.4:
+                lines.append(f"    ProxyJump {random.choice(bastions).alias}")
+            if host.alias.startswith(('db', 'grafana', 'elk')) and random.random() < 0.5:
+                lines.append(f"    LocalForward {random.choice([5432, 3306, 3000, 5601, 9200])} localhost:"
+                             f"{random.choice([5432, 3306, 3000, 5601, 9200])}")
+            blocks.append('\n'.join(lines) + '\n')
+
+        patterns = []
+        for host in hosts:
+            if patterns and len(patterns[-1]) + len(host.alias) + 1 <= self.HOST_LINE_LENGTH:
+                patterns[-1] += f" {host.alias}"
+            else:
+                patterns.append(f"Host {host.alias}")
+        blocks.extend('\n'.join([pattern] + self.DEFAULT_OPTIONS) + '\n' for pattern in patterns)
+        return '\n'.join(blocks)
+
+    def authorized_keys(self, count):
+        """Return authorized_keys text with count keys whose private halves were never generated"""
+        lines = []
+        for _ in range(count):
+            key_type = random.choice(['ed25519', 'ed25519', 'ecdsa'])
+            algorithm = 'ssh-ed25519' if key_type == 'ed25519' else 'ecdsa-sha2-nistp256'
+            blob = base64.b64encode(random_public_blob(key_type)).decode('ascii')
+            comment = random.choice([
+                f"{random.choice(self.PEOPLE)}@laptop-{random.randint(100, 999)}",
+                f"{random.choice(self.PEOPLE)}@{self.hostname}",
+                f"deploy@ci-runner-{random.randint(1, 12):02d}",
+                f"ansible@{random.choice(self.ROLES)}-prod-{random.randint(1, 9):02d}"
+            ])
+            lines.append(f"{random.choice(self.AUTHORIZED_KEY_OPTIONS)}{algorithm} {blob} {comment}\n")
+        return ''.join(lines)
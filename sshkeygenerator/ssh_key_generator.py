@@ -4,20 +4,136 @@ Base SSH Key Generator module
 Contains the abstract base class for SSH key generation
 """
 
-from pathlib import Path
+import getpass
+import re
+import socket
+import stat
+from os_detector import OSDetector
+from honeytoken_registry import register_issued
+from sshkeygenerator.key_material import KEY_POOL
+from sshkeygenerator.key_reservoir import KeyReservoir, fill_in_background
+from sshkeygenerator.ssh_environment import SSHEnvironment
 
 
 class SSHKeyGenerator:
     """Base class for SSH key generation"""
     
+    # Key file stems of every key type ssh looks for, generated or not
+    KEY_FILE_TYPES = ['rsa', 'ed25519', 'ecdsa', 'dsa']
+    # Environment files written next to the keys
+    KNOWN_HOSTS = 'known_hosts'
+    CONFIG = 'config'
+    AUTHORIZED_KEYS = 'authorized_keys'
+    # The environment files also hold the user's own entries; the generated
+    # ones sit between these comment lines so they can be replaced or removed
+    BLOCK_BEGIN = '# >>> A-K-DataTrap generated entries >>>'
+    BLOCK_END = '# <<< A-K-DataTrap generated entries <<<'
+    GENERATED_BLOCK = re.compile(f"^{re.escape(BLOCK_BEGIN)}\n.*?^{re.escape(BLOCK_END)}\n?",
+                                 re.MULTILINE | re.DOTALL)
+    
     def __init__(self):
+        self.profile = OSDetector.get_profile()
         self.ssh_dir = self._get_ssh_directory()
+        # Keypairs written as id_<type> / id_<type>.pub, unique per run
+        self.key_types = ['rsa', 'ed25519', 'ecdsa']
+        self.key_comment = f"{getpass.getuser()}@{socket.gethostname()}"
+        # Keys are claimed from the on-disk reservoirs shared by every process;
+        # the in-process pool, started on first use, covers an empty one
+        self.key_pool = KEY_POOL
+        self.reservoirs = {key_type: KeyReservoir(key_type, rsa_bits=self.key_pool.rsa_bits)
+                           for key_type in self.key_types}
+        # Unused keys per type the reservoirs are topped up to in the background
+        self.reservoir_target = 32
+        # Volume of the environment files
+        self.known_host_count = 2000
+        self.config_host_count = 100
+        self.authorized_key_count = 8
+        # (kind, fingerprint, file name) of the keys in the last generated files
+        self.issued_keys = []
+    
+    @classmethod
+    def key_file_names(cls):
+        """Return the names of every key file the generator can write below ~/.ssh"""
+        names = []
+        for key_type in cls.KEY_FILE_TYPES:
+            names.extend([f"id_{key_type}", f"id_{key_type}.pub"])
+        return names
+    
+    @classmethod
+    def environment_file_names(cls):
+        """Return the names of the files shared with the user's own entries"""
+        return [cls.KNOWN_HOSTS, cls.CONFIG, cls.AUTHORIZED_KEYS]
+    
+    @classmethod
+    def strip_generated_block(cls, content):
+        """Return content without the generated entries, and whether it had any"""
+        stripped, count = cls.GENERATED_BLOCK.subn('', content)
+        return stripped, count > 0
     
     def _get_ssh_directory(self):
         """Get the default SSH directory path for the current OS"""
-        home = Path.home()
+        home = self.profile.home
         return home / '.ssh'
     
+    def _existing_file(self, file_name, default_mode):
+        """Return the user's own content of an ~/.ssh file (without earlier generated entries) and its mode"""
+        path = self.ssh_dir / file_name
+        try:
+            content = path.read_text(encoding='utf-8')
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except (OSError, UnicodeError):
+            return '', default_mode
+        content, _ = self.strip_generated_block(content)
+        return (content if not content or content.endswith('\n') else content + '\n'), mode
+    
+    def _environment_file(self, file_name, generated, default_mode):
+        """Return the content and mode of an environment file, replacing the entries of an earlier run"""
+        content, mode = self._existing_file(file_name, default_mode)
+        return content + f"{self.BLOCK_BEGIN}\n{generated}{self.BLOCK_END}\n", mode
+    
+    def _take_key(self, key_type):
+        """Claim an unused key from the reservoir, or take one from the pool when it is empty"""
+        try:
+            key = self.reservoirs[key_type].claim()
+        except (OSError, ValueError):
+            key = None
+        return key if key is not None else self.key_pool.take(key_type)
+    
+    def _generate_ssh_files(self):
+        """Return (file name, content, mode, label) of the keys and the environment files"""
+        hostname, username = socket.gethostname(), getpass.getuser()
+        environment = SSHEnvironment(hostname, username, self.key_types)
+        # Built before any key is claimed, so an impossible host count wastes no reservoir keys
+        hosts = environment.build_inventory(self.config_host_count)
+        files = []
+        self.issued_keys = []
+        for key_type in self.key_types:
+            key = self._take_key(key_type)
+            # Keys are recorded under the fingerprint sshd logs when they are used
+            self.issued_keys.append((f"ssh_{key_type}", key.fingerprint(), f"id_{key_type}"))
+            files.append((f"id_{key_type}", key.private_pem(self.key_comment), 0o600, "Private key"))
+            files.append((f"id_{key_type}.pub", key.public_line(self.key_comment), 0o644, "Public key"))
+        # Replace the claimed keys while the environment files are built
+        fill_in_background(list(self.reservoirs.values()), self.key_pool, self.reservoir_target)
+        
+        environment_files = [
+            (self.KNOWN_HOSTS, environment.known_hosts(hosts, self.known_host_count), 0o644,
+             f"Known hosts ({self.known_host_count} hashed entries)"),
+            (self.CONFIG, environment.config(hosts), 0o600, f"SSH config ({len(hosts)} hosts)"),
+            # Existing authorized keys are kept so the account stays reachable
+            (self.AUTHORIZED_KEYS, environment.authorized_keys(self.authorized_key_count), 0o600,
+             f"Authorized keys ({self.authorized_key_count} keys)")
+        ]
+        for file_name, generated, default_mode, label in environment_files:
+            content, mode = self._environment_file(file_name, generated, default_mode)
+            files.append((file_name, content, mode, label))
+        return files
+    
+    def _register_issued(self, result):
+        """Record the issued keys in the honeytoken registry once the files are written"""
+        return register_issued(result, [(kind, key_fingerprint, str(self.ssh_dir / file_name))
+                                        for kind, key_fingerprint, file_name in self.issued_keys])
+    
     def generate_keys(self):
         """Abstract method to be implemented by subclasses"""
         raise NotImplementedError("Subclasses must implement generate_keys method")
\ No newline at end of file
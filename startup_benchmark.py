@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark module
+Measures the cold start of main.py and fails when it exceeds a target
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+class StartupBenchmark:
+    """Times fresh interpreter runs of main.py and reports the slowest imports"""
+
+    # Median wall time allowed for `main.py --help`, in milliseconds
+    TARGET_MS = 100.0
+
+    # Modules listed in the import-time breakdown
+    TOP_IMPORTS = 10
+
+    def __init__(self, runs=20, target_ms=TARGET_MS):
+        self.runs = runs
+        self.target_ms = target_ms
+        self.main_path = Path(__file__).resolve().parent / 'main.py'
+
+    def _time_run(self, args):
+        """Return the wall time of one fresh interpreter in milliseconds"""
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return (time.perf_counter() - start) * 1000
+
+    def measure(self):
+        """Return (baseline, startup) samples in milliseconds; the baseline is an empty interpreter"""
+        # One warm-up run writes the bytecode caches so every sample sees the same state
+        self._time_run([str(self.main_path), '--help'])
+        baseline = [self._time_run(['-c', 'pass']) for _ in range(self.runs)]
+        startup = [self._time_run([str(self.main_path), '--help']) for _ in range(self.runs)]
+        return baseline, startup
+
+    def slowest_imports(self):
+        """Return (cumulative microseconds, module) of the slowest imports of main"""
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                                cwd=self.main_path.parent, capture_output=True, text=True)
+        imports = []
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                imports.append((int(parts[1]), parts[2].strip()))
+        return sorted(imports, reverse=True)[:self.TOP_IMPORTS]
+
+    def run(self):
+        """Print the measurements and return the process exit code (1 above target)"""
+        baseline, startup = self.measure()
+        median = statistics.median(startup)
+        print(f"Interpreter baseline: {statistics.median(baseline):.1f} ms (median of {self.runs})")
+        print(f"main.py --help: {median:.1f} ms median, {min(startup):.1f} ms best, {max(startup):.1f} ms worst")
+        print("Slowest imports (cumulative):")
+        for microseconds, module in self.slowest_imports():
+            print(f"  {microseconds / 1000:8.1f} ms  {module}")
+        if median > self.target_ms:
+            print(f"❌ Startup {median:.1f} ms exceeds the {self.target_ms:.0f} ms target")
+            return 1
+        print(f"✅ Startup within the {self.target_ms:.0f} ms target")
+        return 0
+
+
+def main():
+    """Entry point function"""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    target_ms = float(sys.argv[2]) if len(sys.argv) > 2 else StartupBenchmark.TARGET_MS
+    sys.exit(StartupBenchmark(runs, target_ms).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -5,87 +5,723 @@ Contains the abstract base class for web history injection
 """
 
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import base64
+import configparser
 import json
-from datetime import datetime, timedelta
+import math
+import os
+from datetime import datetime
+from urllib.parse import urlsplit
 import random
+import signal
+import sqlite3
+import sys
+import time
+from os_detector import OSDetector
+from output_router import ThreadOutputRouter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 class WebHistoryData:
     """Class to manage fake web history data"""
     
+    # Relative likelihood of starting a browsing session in each hour of the day
+    HOURLY_ACTIVITY = (
+        0.05, 0.03, 0.02, 0.02, 0.02, 0.04, 0.10, 0.30, 0.55, 0.75, 0.85, 0.80,
+        0.70, 0.80, 0.85, 0.80, 0.75, 0.70, 0.65, 0.75, 0.90, 1.00, 0.70, 0.25
+    )
+    
+    # Average number of page views in one browsing session
+    MEAN_SESSION_LENGTH = 6
+    
+    # Probability that the next page view of a session moves to another site
+    SITE_HOP_PROBABILITY = 0.2
+    
+    # Values substituted into the {field} placeholders of the page templates
+    FIELDS = {
+        'query': ['python+list+comprehension', 'weather+tomorrow', 'docker+compose+networking',
+                  'best+laptop+2025', 'how+to+center+a+div', 'git+rebase+vs+merge', 'cheap+flights+paris',
+                  'kubernetes+ingress+tls', 'pasta+carbonara+recipe', 'postgres+vacuum+full',
+                  'linux+check+disk+usage', 'react+useeffect+cleanup', 'nginx+reverse+proxy+config'],
+        'repo': ['torvalds/linux', 'microsoft/vscode', 'facebook/react', 'python/cpython',
+                 'kubernetes/kubernetes', 'rust-lang/rust', 'golang/go', 'hashicorp/terraform'],
+        'number': ['1024', '2291', '3187', '4410', '5127', '6093', '7245', '8812'],
+        'video': ['dQw4w9WgXcQ', 'kJQP7kiw5Fk', '9bZkp7q19f0', 'JGwWNGJdvx8', 'RgKAFK5djSk', 'OPf0YbXqDm0'],
+        'channel': ['veritasium', 'fireship', 'mkbhd', 'lineartechtips', 'computerphile'],
+        'article': ['Python_(programming_language)', 'Linux_kernel', 'Transport_Layer_Security',
+                    'World_Wide_Web', 'Public-key_cryptography', 'SQLite', 'Unix_time'],
+        'subreddit': ['programming', 'linux', 'sysadmin', 'python', 'netsec', 'homelab', 'worldnews'],
+        'question': ['11227809', '4934913', '1132941', '6470428', '927358', '2003505', '231767'],
+        'product': ['B08N5WRWNW', 'B07FZ8S74R', 'B09G9FPHY6', 'B0BSHF7WHW', 'B07XJ8C8F5'],
+        'story': ['38472001', '38490215', '38511873', '38530042', '38557713'],
+        'company': ['google', 'microsoft', 'amazon', 'netflix', 'cloudflare', 'stripe'],
+        'playlist': ['37i9dQZF1DXcBWIGoYBM5M', '37i9dQZF1DX0XUsuxWHRQd', '37i9dQZF1DWXRqgorJj26U'],
+        'title': ['Browse', 'My List', 'New & Popular', 'Continue Watching']
+    }
+    
+    # Site catalogue: relative popularity plus (path template, title template) pages
+    SITES = [
+        {"host": "https://www.google.com", "weight": 30, "pages": [
+            ("/", "Google"),
+            ("/search?q={query}", "{query_text} - Google Search")]},
+        {"host": "https://mail.google.com", "weight": 12, "pages": [
+            ("/mail/u/0/#inbox", "Inbox - Gmail"),
+            ("/mail/u/0/#sent", "Sent Mail - Gmail")]},
+        {"host": "https://www.youtube.com", "weight": 14, "pages": [
+            ("/", "YouTube"),
+            ("/watch?v={video}", "YouTube"),
+            ("/@{channel}", "{channel} - YouTube"),
+            ("/results?search_query={query}", "{query_text} - YouTube")]},
+        {"host": "https://github.com", "weight": 10, "pages": [
+            ("/", "GitHub"),
+            ("/{repo}", "{repo}: GitHub"),
+            ("/{repo}/issues/{number}", "Issue #{number} · {repo} · GitHub"),
+            ("/{repo}/pull/{number}", "Pull Request #{number} · {repo} · GitHub")]},
+        {"host": "https://stackoverflow.com", "weight": 8, "pages": [
+            ("/questions/{question}", "{query_text} - Stack Overflow"),
+            ("/search?q={query}", "Search Results - Stack Overflow")]},
+        {"host": "https://www.reddit.com", "weight": 7, "pages": [
+            ("/", "Reddit - Dive into anything"),
+            ("/r/{subreddit}/", "r/{subreddit}"),
+            ("/r/{subreddit}/comments/{story}/", "r/{subreddit} - Reddit")]},
+        {"host": "https://en.wikipedia.org", "weight": 6, "pages": [
+            ("/wiki/{article}", "{article_text} - Wikipedia")]},
+        {"host": "https://www.amazon.com", "weight": 5, "pages": [
+            ("/", "Amazon.com: Online Shopping"),
+            ("/dp/{product}", "Amazon.com"),
+            ("/s?k={query}", "Amazon.com : {query_text}")]},
+        {"host": "https://www.linkedin.com", "weight": 3, "pages": [
+            ("/feed/", "Feed | LinkedIn"),
+            ("/company/{company}/", "{company_text} | LinkedIn")]},
+        {"host": "https://news.ycombinator.com", "weight": 4, "pages": [
+            ("/", "Hacker News"),
+            ("/item?id={story}", "Hacker News")]},
+        {"host": "https://x.com", "weight": 4, "pages": [
+            ("/home", "Home / X"),
+            ("/{company}", "{company_text} / X")]},
+        {"host": "https://medium.com", "weight": 2, "pages": [
+            ("/tag/{subreddit}", "{subreddit_text} – Medium")]},
+        {"host": "https://www.netflix.com", "weight": 2, "pages": [
+            ("/browse", "Netflix"),
+            ("/browse/my-list", "{title} - Netflix")]},
+        {"host": "https://open.spotify.com", "weight": 3, "pages": [
+            ("/", "Spotify - Web Player"),
+            ("/playlist/{playlist}", "Spotify - Web Player")]},
+        {"host": "https://www.facebook.com", "weight": 3, "pages": [
+            ("/", "Facebook"),
+            ("/groups/{company}", "Facebook")]}
+    ]
+    
     @staticmethod
-    def get_fake_history():
+    def _humanize(value):
+        """Turn a URL slug into readable title text"""
+        return value.replace('+', ' ').replace('_', ' ').replace('-', ' ')
+    
+    @classmethod
+    def _expand_page(cls, site):
+        """Pick one page of a site and fill its template fields"""
+        path, title = random.choice(site["pages"])
+        if '{' not in path and '{' not in title:
+            return site["host"] + path, title
+        values = {}
+        for name, choices in cls.FIELDS.items():
+            if '{' + name in path or '{' + name in title:
+                value = random.choice(choices)
+                values[name] = value
+                values[name + '_text'] = cls._humanize(value)
+        # Titles such as Stack Overflow questions reuse the search text
+        if '{query_text}' in title and 'query' not in values:
+            values['query_text'] = cls._humanize(random.choice(cls.FIELDS['query']))
+        return site["host"] + path.format(**values), title.format(**values)
+    
+    @classmethod
+    def iter_visits(cls, count, visits_per_day=120, end_time=None):
+        """Lazily yield count (url, title, unix_time, typed) visits, most recent first
+        
+        Visits are grouped into browsing sessions whose start times follow
+        HOURLY_ACTIVITY. Only the current session is held in memory, so any
+        number of visits can be streamed.
+        """
+        end = (end_time or datetime.now()).timestamp()
+        sites = cls.SITES
+        cum_weights = []
+        total = 0
+        for site in sites:
+            total += site["weight"]
+            cum_weights.append(total)
+        
+        # Mean gap between session starts that yields visits_per_day once the
+        # diurnal rejection below is applied
+        mean_activity = sum(cls.HOURLY_ACTIVITY) / len(cls.HOURLY_ACTIVITY)
+        mean_gap = 86400 * mean_activity * cls.MEAN_SESSION_LENGTH / max(visits_per_day, 1)
+        
+        remaining = count
+        current = end
+        while remaining > 0:
+            current -= random.expovariate(1.0 / mean_gap)
+            hour = time.localtime(current).tm_hour
+            if random.random() > cls.HOURLY_ACTIVITY[hour]:
+                continue
+            
+            length = min(remaining, 1 + int(random.expovariate(1.0 / (cls.MEAN_SESSION_LENGTH - 1))))
+            site = random.choices(sites, cum_weights=cum_weights)[0]
+            # Walk the session backwards from its last page view to the typed first one
+            visit_time = current
+            for position in range(length - 1, -1, -1):
+                if position and random.random() < cls.SITE_HOP_PROBABILITY:
+                    site = random.choices(sites, cum_weights=cum_weights)[0]
+                url, title = cls._expand_page(site)
+                yield url, title, visit_time, position == 0
+                visit_time -= random.uniform(5, 240)
+            
+            current = visit_time
+            remaining -= length
+    
+    @staticmethod
+    def get_fake_history(count=76):
         """Generate fake browsing history data"""
-        base_time = datetime.now()
-        history_entries = []
-        
-        # Sample websites with realistic visit patterns
-        websites = [
-            {"url": "https://www.google.com", "title": "Google", "visits": 15},
-            {"url": "https://www.youtube.com", "title": "YouTube", "visits": 8},
-            {"url": "https://www.facebook.com", "title": "Facebook", "visits": 5},
-            {"url": "https://www.amazon.com", "title": "Amazon", "visits": 3},
-            {"url": "https://www.wikipedia.org", "title": "Wikipedia", "visits": 4},
-            {"url": "https://www.reddit.com", "title": "Reddit", "visits": 6},
-            {"url": "https://www.twitter.com", "title": "Twitter", "visits": 4},
-            {"url": "https://www.linkedin.com", "title": "LinkedIn", "visits": 2},
-            {"url": "https://www.stackoverflow.com", "title": "Stack Overflow", "visits": 3},
-            {"url": "https://www.github.com", "title": "GitHub", "visits": 5},
-            {"url": "https://www.news.ycombinator.com", "title": "Hacker News", "visits": 2},
-            {"url": "https://www.medium.com", "title": "Medium", "visits": 3},
-            {"url": "https://www.netflix.com", "title": "Netflix", "visits": 2},
-            {"url": "https://www.spotify.com", "title": "Spotify", "visits": 4},
-            {"url": "https://www.gmail.com", "title": "Gmail", "visits": 10},
+        return [
+            {
+                "url": url,
+                "title": title,
+                "visit_time": datetime.fromtimestamp(timestamp),
+                "visit_count": random.randint(1, 5)
+            }
+            for url, title, timestamp, typed in WebHistoryData.iter_visits(count)
         ]
-        
-        # Generate entries for the past 30 days
-        for site in websites:
-            for i in range(site["visits"]):
-                # Random time within the last 30 days
-                days_ago = random.randint(0, 30)
-                hours_ago = random.randint(0, 23)
-                minutes_ago = random.randint(0, 59)
-                
-                visit_time = base_time - timedelta(
-                    days=days_ago, 
-                    hours=hours_ago, 
-                    minutes=minutes_ago
-                )
-                
-                history_entries.append({
-                    "url": site["url"],
-                    "title": site["title"],
-                    "visit_time": visit_time,
-                    "visit_count": random.randint(1, 5)
-                })
-        
-        # Sort by visit time (most recent first)
-        history_entries.sort(key=lambda x: x["visit_time"], reverse=True)
-        return history_entries
 
 
 class WebHistoryInjector:
     """Base class for web history injection"""
     
+    # Chromium PAGE_TRANSITION_LINK with the CHAIN_START/CHAIN_END qualifiers;
+    # OR-ing in 1 turns it into PAGE_TRANSITION_TYPED
+    CHROMIUM_TRANSITION = 805306368
+    
+    # Firefox moz_historyvisits.visit_type values (TRANSITION_LINK, TRANSITION_TYPED)
+    FIREFOX_VISIT_LINK = 1
+    FIREFOX_VISIT_TYPED = 2
+    # Firefox hashes at most this many bytes of a URL for moz_places.url_hash
+    FIREFOX_MAX_CHARS_TO_HASH = 1500
+    
+    # Firefox frecency defaults: (max age in days, weight) buckets, the weight of
+    # older visits, the bonus per visit type and how many recent visits are sampled
+    FRECENCY_BUCKETS = ((4, 100), (14, 70), (31, 50), (90, 30))
+    FRECENCY_OLD_VISIT_WEIGHT = 10
+    FRECENCY_BONUS = {FIREFOX_VISIT_LINK: 100, FIREFOX_VISIT_TYPED: 2000}
+    FRECENCY_SAMPLES = 10
+    
+    # Seconds between the Windows/Chrome epoch (1601-01-01) and the Unix epoch
+    CHROME_EPOCH_OFFSET = 11644473600
+    
+    # Number of visits injected per browser database unless configured otherwise
+    DEFAULT_VISIT_COUNT = 1000
+    
+    # Linux FICLONE ioctl: share the source extents copy-on-write
+    FICLONE = 0x40049409
+    # Filesystems implementing FICLONE; others skip the attempt
+    REFLINK_FILESYSTEMS = {'btrfs', 'xfs', 'bcachefs', 'ocfs2', 'zfs'}
+    
     def __init__(self):
-        self.history_data = WebHistoryData.get_fake_history()
+        self.profile = OSDetector.get_profile()
+        self.visit_count = self.DEFAULT_VISIT_COUNT
+        self.visits_per_day = 120
+        # Upper bound on browser databases injected at the same time
+        self.max_workers = 8
+        # PRAGMAs applied while bulk writing; None leaves the database setting untouched.
+        # journal_mode is restored afterwards, synchronous only lasts for the connection.
+        self.write_pragmas = {'journal_mode': None, 'synchronous': 'NORMAL'}
+        # Pages copied per step of the SQLite online backup; -1 copies everything at once
+        self.backup_pages_per_step = 1024
+        # Seconds to wait for browsers to release their database locks after being signalled
+        self.unlock_timeout = 10.0
+        self._statement_cache = {}
+    
+    def _discover_chromium_profiles(self, user_data_dir):
+        """Find every profile (Default, Profile 1, ...) with a History database"""
+        profiles = []
+        if not user_data_dir.is_dir():
+            return profiles
+        for profile_dir in sorted(user_data_dir.iterdir()):
+            if profile_dir.name == 'Default' or profile_dir.name.startswith('Profile '):
+                history = profile_dir / 'History'
+                if history.is_file():
+                    profiles.append((profile_dir.name, history))
+        return profiles
+    
+    def _discover_firefox_profiles(self, firefox_root):
+        """Find every Firefox profile listed in profiles.ini, scanning directories as a fallback"""
+        profiles = []
+        profiles_ini = firefox_root / 'profiles.ini'
+        if profiles_ini.is_file():
+            config = configparser.ConfigParser(interpolation=None)
+            try:
+                config.read(profiles_ini, encoding='utf-8')
+            except configparser.Error as e:
+                print(f"Warning: Could not parse {profiles_ini}: {e}")
+            for section in config.sections():
+                if not section.startswith('Profile') or not config.has_option(section, 'Path'):
+                    continue
+                profile_path = Path(config.get(section, 'Path'))
+                if config.get(section, 'IsRelative', fallback='1') == '1':
+                    profile_path = firefox_root / profile_path
+                places = profile_path / 'places.sqlite'
+                if places.is_file():
+                    profiles.append((config.get(section, 'Name', fallback=profile_path.name), places))
+            if profiles:
+                return profiles
+        
+        for search_dir in (firefox_root, firefox_root / 'Profiles'):
+            if search_dir.is_dir():
+                for profile_dir in sorted(search_dir.iterdir()):
+                    places = profile_dir / 'places.sqlite'
+                    if places.is_file():
+                        profiles.append((profile_dir.name, places))
+        return profiles
     
     def get_browser_paths(self):
-        """Abstract method to get browser database paths"""
-        raise NotImplementedError("Subclasses must implement get_browser_paths method")
+        """Return (label, browser kind, database path) for every discovered browser profile"""
+        databases = []
+        for browser_name, kind, install_dir in self.profile.browsers:
+            if kind == 'firefox':
+                for profile, places in self._discover_firefox_profiles(install_dir):
+                    databases.append((f"{browser_name} ({profile})", 'firefox', places))
+            else:
+                for profile, history in self._discover_chromium_profiles(install_dir):
+                    databases.append((f"{browser_name} ({profile})", 'chromium', history))
+        return databases
     
-    def inject_history(self):
-        """Abstract method to inject history into browsers"""
+    def _inject_database(self, router, label, kind, db_path):
+        """Inject one database in a worker thread, buffering its console output"""
+        router.capture()
+        try:
+            if kind == 'firefox':
+                success = self._inject_firefox_history(db_path)
+            else:
+                success = self._inject_chromium_history(db_path, label)
+        except Exception as e:
+            print(f"❌ Error injecting {label} history: {e}")
+            success = False
+        finally:
+            output = router.release()
+        return success, output
+    
+    def _inject_databases(self, databases):
+        """Inject every database in a worker pool and return (label, success) in discovery order"""
+        if not databases:
+            return []
+        
+        router = ThreadOutputRouter(sys.stdout)
+        sys.stdout = router
+        outcomes = []
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(databases))) as executor:
+                futures = [
+                    executor.submit(self._inject_database, router, label, kind, db_path)
+                    for label, kind, db_path in databases
+                ]
+                for (label, _, _), future in zip(databases, futures):
+                    success, output = future.result()
+                    router.stream.write(output)
+                    outcomes.append((label, success))
+        finally:
+            sys.stdout = router.stream
+        return outcomes
+    
+    def inject_history(self, assume_yes=False):
+        """Abstract method to inject history into browsers (assume_yes skips the confirmation prompt)"""
         raise NotImplementedError("Subclasses must implement inject_history method")
     
+    def _find_database_holders(self, db_paths):
+        """Abstract method returning {pid: process name} for processes holding the databases open"""
+        raise NotImplementedError("Subclasses must implement _find_database_holders method")
+    
+    def _signal_process(self, pid, force=False):
+        """Ask a process to exit (force kills it outright); returns False if it could not be signalled"""
+        try:
+            os.kill(pid, signal.SIGKILL if force and hasattr(signal, 'SIGKILL') else signal.SIGTERM)
+            return True
+        except ProcessLookupError:
+            return True
+        except OSError as e:
+            print(f"Warning: Could not signal process {pid}: {e}")
+            return False
+    
+    def _database_sidecars(self, db_path):
+        """Return the database file together with its journal, WAL and shared-memory files"""
+        return [db_path] + [db_path.with_name(db_path.name + suffix) for suffix in ('-journal', '-wal', '-shm')]
+    
+    def _is_database_locked(self, db_path):
+        """Return True if another connection currently prevents writing to the database"""
+        try:
+            conn = sqlite3.connect(str(db_path), timeout=0)
+        except sqlite3.Error:
+            return False
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+            return False
+        except sqlite3.OperationalError as e:
+            message = str(e).lower()
+            return 'locked' in message or 'busy' in message
+        finally:
+            conn.close()
+    
+    def _wait_for_unlock(self, db_paths, timeout):
+        """Poll the databases with exponential backoff until none is locked; returns those still locked"""
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        locked = [db_path for db_path in db_paths if self._is_database_locked(db_path)]
+        while locked and time.monotonic() < deadline:
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 0.5)
+            locked = [db_path for db_path in locked if self._is_database_locked(db_path)]
+        return locked
+    
+    def _kill_browser_processes(self, databases):
+        """Stop only the processes holding the target databases and wait for their locks to clear
+        
+        Holders are asked to exit first and killed only if their locks outlive
+        unlock_timeout. Returns the "name (pid)" of every process signalled.
+        """
+        db_paths = [db_path for _, _, db_path in databases]
+        holders = self._find_database_holders(db_paths)
+        signalled = [pid for pid in holders if self._signal_process(pid)]
+        
+        locked = self._wait_for_unlock(db_paths, self.unlock_timeout)
+        if locked and signalled:
+            remaining = self._find_database_holders(locked)
+            for pid in remaining:
+                self._signal_process(pid, force=True)
+            locked = self._wait_for_unlock(locked, self.unlock_timeout)
+        for db_path in locked:
+            print(f"Warning: {db_path} is still locked by another process")
+        
+        killed = [f"{holders[pid]} ({pid})" for pid in signalled]
+        if killed:
+            print(f"Stopped browser processes: {', '.join(killed)}")
+        return killed
+    
     def backup_existing_history(self, db_path):
         """Create backup of existing browser history"""
         if db_path.exists():
             backup_path = db_path.with_suffix(f"{db_path.suffix}.backup")
             try:
-                import shutil
-                shutil.copy2(db_path, backup_path)
+                self.backup_database(db_path, backup_path)
                 return backup_path
             except Exception as e:
                 print(f"Warning: Could not backup {db_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+    
+    def _has_pending_journal(self, db_path):
+        """Return True if a WAL or rollback journal may hold changes missing from the main file"""
+        for suffix in ('-wal', '-journal'):
+            sidecar = db_path.with_name(db_path.name + suffix)
+            if sidecar.exists() and sidecar.stat().st_size > 0:
+                return True
+        return False
+    
+    def _reflink_database(self, db_path, backup_path):
+        """Clone the database file copy-on-write where the filesystem supports it"""
+        if fcntl is None or self._has_pending_journal(db_path):
+            return False
+        if self.profile.filesystem != 'unknown' and self.profile.filesystem not in self.REFLINK_FILESYSTEMS:
+            return False
+        try:
+            with open(db_path, 'rb') as source, open(backup_path, 'wb') as target:
+                fcntl.ioctl(target.fileno(), self.FICLONE, source.fileno())
+            return True
+        except OSError:
+            return False
+    
+    def backup_database(self, db_path, backup_path):
+        """Take a consistent backup of a SQLite database and return the method used
+        
+        A reflink is used when the filesystem can share extents and no journal
+        is pending, otherwise the SQLite online backup API copies the pages
+        (folding in any WAL content) in steps of backup_pages_per_step.
+        Hard links are never used because injection writes the file in place.
+        """
+        if self._reflink_database(db_path, backup_path):
+            return 'reflink'
+        
+        source = sqlite3.connect(str(db_path))
+        try:
+            target = sqlite3.connect(str(backup_path))
+            try:
+                source.backup(target, pages=self.backup_pages_per_step)
+            finally:
+                target.close()
+        finally:
+            source.close()
+        return 'sqlite backup'
+    
+    def _get_table_columns(self, conn, table_name):
+        """Return a list of column names for a given table"""
+        cursor = conn.execute(f"PRAGMA table_info({table_name})")
+        return [row[1] for row in cursor.fetchall()]
+    
+    def _build_insert_sql(self, table_name, columns, verb="INSERT"):
+        """Build a parameterised INSERT statement for the given columns"""
+        placeholders = ", ".join("?" for _ in columns)
+        return f"{verb} INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+    
+    def _get_chromium_statements(self, url_columns, visit_columns):
+        """Prepare the urls/visits INSERT statements once per schema"""
+        key = (tuple(url_columns), tuple(visit_columns))
+        if key not in self._statement_cache:
+            url_fields = ["id", "url", "title", "visit_count", "typed_count", "last_visit_time", "hidden"]
+            if "favicon_id" in url_columns:
+                url_fields.append("favicon_id")
+            visit_fields = ["url", "visit_time", "from_visit", "transition", "segment_id"]
+            for optional in ("visit_duration", "is_indexed"):
+                if optional in visit_columns:
+                    visit_fields.append(optional)
+            self._statement_cache[key] = (
+                self._build_insert_sql("urls", url_fields, "INSERT OR REPLACE"), len(url_fields),
+                self._build_insert_sql("visits", visit_fields), visit_fields
+            )
+        return self._statement_cache[key]
+    
+    @contextmanager
+    def _bulk_transaction(self, conn):
+        """Run the enclosed writes in one explicit transaction with the write PRAGMAs applied"""
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None  # Manage BEGIN/COMMIT ourselves
+        previous_journal_mode = None
+        
+        journal_mode = self.write_pragmas.get('journal_mode')
+        if journal_mode:
+            previous_journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        synchronous = self.write_pragmas.get('synchronous')
+        if synchronous:
+            conn.execute(f"PRAGMA synchronous = {synchronous}")
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            if previous_journal_mode and previous_journal_mode.lower() != journal_mode.lower():
+                conn.execute(f"PRAGMA journal_mode = {previous_journal_mode}")
+            conn.isolation_level = isolation_level
+    
+    def _bulk_insert_chromium(self, conn, url_columns, visit_columns, url_records, visit_records):
+        """Stream urls/visits records into a Chromium History database in one transaction
+        
+        url_records yields (id, url, title, visit_count, last_visit_time) and
+        visit_records yields (url_id, visit_time, typed); both may be lazy iterables.
+        """
+        url_sql, url_width, visit_sql, visit_fields = self._get_chromium_statements(url_columns, visit_columns)
+        favicon = (0,) if url_width == 8 else ()
+        with_duration = "visit_duration" in visit_fields
+        with_indexed = "is_indexed" in visit_fields
+        
+        url_rows = (
+            (url_id, url, title, visit_count, 1, last_visit_time, 0) + favicon
+            for url_id, url, title, visit_count, last_visit_time in url_records
+        )
+        
+        def visit_rows():
+            for url_id, visit_time, typed in visit_records:
+                row = (url_id, visit_time, 0, self.CHROMIUM_TRANSITION | typed, 0)
+                if with_duration:
+                    row += (random.randint(30000, 300000),)
+                if with_indexed:
+                    row += (0,)
+                yield row
+        
+        with self._bulk_transaction(conn):
+            # Visits go first so url_records may be filled in while they stream
+            conn.executemany(visit_sql, visit_rows())
+            conn.executemany(url_sql, url_rows)
+    
+    @staticmethod
+    def _hash_string(data):
+        """Firefox's mozilla::HashString (golden-ratio rotate/xor hash) over UTF-8 bytes"""
+        value = 0
+        for byte in data:
+            value = (0x9E3779B9 * ((((value << 5) | (value >> 27)) & 0xFFFFFFFF) ^ byte)) & 0xFFFFFFFF
+        return value
+    
+    def _url_hash(self, url):
+        """Compute moz_places.url_hash the way Firefox's hash() SQL function does"""
+        data = url.encode('utf-8')
+        url_hash = self._hash_string(data[:self.FIREFOX_MAX_CHARS_TO_HASH])
+        # Only a scheme (a ':' within the first 50 characters) adds the 16-bit prefix hash
+        colon = data.find(b':', 0, 50)
+        if colon == -1:
+            return url_hash
+        return ((self._hash_string(data[:colon]) & 0xFFFF) << 32) + url_hash
+    
+    @staticmethod
+    def _make_guid():
+        """Return a 12 character url-safe base64 guid like the ones Places generates"""
+        return base64.urlsafe_b64encode(os.urandom(9)).decode('ascii')
+    
+    @staticmethod
+    def _split_origin(url):
+        """Return (prefix, host, rev_host) for a URL, e.g. ('https://', 'github.com', 'moc.buhtig.')"""
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        return f"{parts.scheme}://", parts.netloc.lower(), host[::-1] + '.'
+    
+    def _frecency_points(self, age_days, visit_type):
+        """Score one sampled visit from its age bucket and visit type bonus"""
+        weight = self.FRECENCY_OLD_VISIT_WEIGHT
+        for max_age, bucket_weight in self.FRECENCY_BUCKETS:
+            if age_days <= max_age:
+                weight = bucket_weight
+                break
+        return weight * self.FRECENCY_BONUS[visit_type] / 100
+    
+    def _get_firefox_statements(self, place_columns, origin_columns):
+        """Prepare the moz_places/moz_historyvisits/moz_origins statements once per schema"""
+        key = ('firefox', tuple(place_columns), tuple(origin_columns))
+        if key not in self._statement_cache:
+            place_fields = [field for field in (
+                "id", "url", "title", "rev_host", "visit_count", "hidden", "typed", "frecency",
+                "last_visit_date", "guid", "url_hash", "origin_id"
+            ) if field in place_columns]
+            statements = {
+                'visit': "INSERT INTO moz_historyvisits (place_id, visit_date, visit_type, session) VALUES (?, ?, ?, 0)",
+                'place': self._build_insert_sql("moz_places", place_fields),
+                'place_fields': place_fields,
+                # moz_places.url has no index of its own; url_hash has
+                'existing': ("SELECT id FROM moz_places WHERE url_hash = ? AND url = ?" if 'url_hash' in place_columns
+                             else "SELECT id FROM moz_places WHERE url = ?"),
+                'existing_by_hash': 'url_hash' in place_columns,
+                'merge': """UPDATE moz_places SET visit_count = visit_count + ?, typed = MAX(typed, ?),
+                            frecency = MAX(frecency, ?), last_visit_date = MAX(IFNULL(last_visit_date, 0), ?)
+                            WHERE id = ?""",
+                'remap': "UPDATE moz_historyvisits SET place_id = ? WHERE place_id = ?"
+            }
+            if origin_columns:
+                statements['origin_insert'] = "INSERT OR IGNORE INTO moz_origins (prefix, host, frecency) VALUES (?, ?, 0)"
+                statements['origin_update'] = "UPDATE moz_origins SET frecency = frecency + ? WHERE prefix = ? AND host = ?"
+            self._statement_cache[key] = statements
+        return self._statement_cache[key]
+    
+    def _bulk_insert_firefox(self, conn):
+        """Stream visits, places and origins into a Firefox places.sqlite in one transaction
+        
+        Visits are inserted while the model streams, then places are scored in
+        passes over the distinct URLs: url_hash, guid, rev_host and frecency are
+        computed in Python, moz_origins is upserted with the summed frecency and
+        URLs that already exist are merged into their place instead of replaced.
+        Returns the number of distinct places written or merged.
+        """
+        place_columns = self._get_table_columns(conn, "moz_places")
+        origin_columns = self._get_table_columns(conn, "moz_origins")
+        statements = self._get_firefox_statements(place_columns, origin_columns)
+        first_id = (conn.execute("SELECT MAX(id) FROM moz_places").fetchone()[0] or 0) + 1
+        
+        visit_records, place_records, place_ids = self._history_records(first_id, self._to_firefox_time)
+        now = self._to_firefox_time(time.time())
+        samples = {}
+        typed_places = set()
+        
+        def visit_rows():
+            # Visits arrive most recent first, so the first samples per place are the newest
+            for place_id, visit_date, typed in visit_records:
+                visit_type = self.FIREFOX_VISIT_TYPED if typed else self.FIREFOX_VISIT_LINK
+                if typed:
+                    typed_places.add(place_id)
+                points = samples.setdefault(place_id, [])
+                if len(points) < self.FRECENCY_SAMPLES:
+                    points.append(self._frecency_points((now - visit_date) / 86400000000, visit_type))
+                yield place_id, visit_date, visit_type
+        
+        with self._bulk_transaction(conn):
+            conn.executemany(statements['visit'], visit_rows())
+            
+            # Pass 1: derive the per-place fields and aggregate origin frecency
+            places = []
+            origin_frecency = {}
+            for place_id, url, title, visit_count, last_visit_date in place_records:
+                points = samples[place_id]
+                frecency = math.ceil(visit_count * sum(points) / len(points))
+                prefix, host, rev_host = self._split_origin(url)
+                origin_frecency[(prefix, host)] = origin_frecency.get((prefix, host), 0) + frecency
+                places.append((place_id, url, title, rev_host, visit_count, int(place_id in typed_places),
+                               frecency, last_visit_date, self._url_hash(url), (prefix, host)))
+            
+            # Pass 2: upsert origins and resolve their ids
+            origin_ids = {}
+            if origin_columns:
+                conn.executemany(statements['origin_insert'], origin_frecency)
+                conn.executemany(statements['origin_update'],
+                                 ((frecency, prefix, host) for (prefix, host), frecency in origin_frecency.items()))
+                for prefix, host in origin_frecency:
+                    origin_ids[(prefix, host)] = conn.execute(
+                        "SELECT id FROM moz_origins WHERE prefix = ? AND host = ?", (prefix, host)
+                    ).fetchone()[0]
+            
+            # Pass 3: merge URLs the profile already knows, insert the rest
+            merges, remaps, rows = [], [], []
+            for place_id, url, title, rev_host, visit_count, typed, frecency, last_visit_date, url_hash, origin in places:
+                lookup = (url_hash, url) if statements['existing_by_hash'] else (url,)
+                existing = conn.execute(statements['existing'], lookup).fetchone()
+                if existing:
+                    remaps.append((existing[0], place_id))
+                    merges.append((visit_count, typed, frecency, last_visit_date, existing[0]))
+                    continue
+                values = {
+                    "id": place_id, "url": url, "title": title, "rev_host": rev_host, "visit_count": visit_count,
+                    "hidden": 0, "typed": typed, "frecency": frecency, "last_visit_date": last_visit_date,
+                    "guid": self._make_guid(), "url_hash": url_hash, "origin_id": origin_ids.get(origin)
+                }
+                rows.append(tuple(values[field] for field in statements['place_fields']))
+            conn.executemany(statements['remap'], remaps)
+            conn.executemany(statements['merge'], merges)
+            conn.executemany(statements['place'], rows)
+        
+        return len(place_ids)
+    
+    def _history_records(self, first_id, convert_time):
+        """Stream visits from WebHistoryData and derive one URL row per distinct URL
+        
+        Returns (visit_records, url_records, url_ids). visit_records yields
+        (url_id, visit_time, typed); url_records yields (id, url, title, visit_count,
+        last_visit_time) and must be consumed after visit_records. Memory grows
+        with the number of distinct URLs, never with the number of visits.
+        """
+        url_ids = {}
+        url_stats = {}
+        
+        def visit_records():
+            for url, title, timestamp, typed in WebHistoryData.iter_visits(self.visit_count, self.visits_per_day):
+                visit_time = convert_time(timestamp)
+                url_id = url_ids.get(url)
+                if url_id is None:
+                    url_id = url_ids[url] = first_id + len(url_ids)
+                    url_stats[url_id] = [url, title, 0, visit_time]
+                stats = url_stats[url_id]
+                stats[2] += 1
+                if visit_time > stats[3]:
+                    stats[3] = visit_time
+                yield url_id, visit_time, int(typed)
+        
+        def url_records():
+            for url_id, (url, title, visit_count, last_visit_time) in url_stats.items():
+                yield url_id, url, title, visit_count, last_visit_time
+        
+        return visit_records(), url_records(), url_ids
+    
+    def _to_chrome_time(self, timestamp):
+        """Convert a Unix timestamp to Chrome's microseconds since 1601"""
+        return int((timestamp + self.CHROME_EPOCH_OFFSET) * 1000000)
+    
+    def _to_firefox_time(self, timestamp):
+        """Convert a Unix timestamp to Firefox's microseconds since 1970"""
+        return int(timestamp * 1000000)